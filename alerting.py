@@ -1,11 +1,180 @@
 # alerting.py
+import logging
+import os
+import queue
+import threading
+import time
+
 import requests
-import json
 
-TEAMS_WEBHOOK = "https://example.com"
+TEAMS_WEBHOOK = os.getenv("TEAMS_WEBHOOK_URL") or "https://example.com"
+
+_STOP = object()
+
+
+class AlertDispatcher:
+    """
+    Background, coalescing Teams alert sender.
+
+    submit() never blocks the caller: alerts go into a bounded queue and are
+    dropped with a warning when it is full. Alerts with the same key (URL,
+    domain, ...) are suppressed for dedup_window seconds. The sender thread
+    merges everything that arrives within flush_interval into one digest
+    message, keeps posts at least min_interval seconds apart and retries
+    failed posts with exponential backoff, honouring Retry-After on 429.
+    """
+
+    def __init__(self, webhook=None, max_queue=1000, dedup_window=3600, flush_interval=10.0,
+                 min_interval=2.0, max_retries=4, backoff=2.0, timeout=10, max_digest_lines=50):
+        self.webhook = webhook or TEAMS_WEBHOOK
+        self.dedup_window = dedup_window
+        self.flush_interval = flush_interval
+        self.min_interval = min_interval
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.max_digest_lines = max_digest_lines
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._last_seen = {}
+        self._last_prune = time.monotonic()
+        self._next_post = 0.0
+        self._thread = None
+        self.stats = {"queued": 0, "suppressed": 0, "dropped": 0, "sent": 0, "failed": 0}
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="alert-dispatcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def submit(self, message, key=None) -> bool:
+        """Queue an alert; returns False if it was deduplicated or the queue is full."""
+        now = time.monotonic()
+        with self._lock:
+            self._prune(now)
+            if key is not None:
+                last = self._last_seen.get(key)
+                if last is not None and now - last < self.dedup_window:
+                    self.stats["suppressed"] += 1
+                    return False
+            try:
+                self._queue.put_nowait(message)
+            except queue.Full:
+                self.stats["dropped"] += 1
+                logging.warning(f"Alert queue full, dropping alert: {message[:200]}")
+                return False
+            # only a queued alert starts the dedup window, so a dropped one can be re-sent
+            if key is not None:
+                self._last_seen[key] = now
+            self.stats["queued"] += 1
+        return True
+
+    def _prune(self, now):
+        """Forget keys whose dedup window has passed (caller holds the lock)."""
+        if now - self._last_prune < min(self.dedup_window, 60.0):
+            return
+        self._last_prune = now
+        expired = [k for k, t in self._last_seen.items() if now - t >= self.dedup_window]
+        for k in expired:
+            del self._last_seen[k]
+
+    def close(self):
+        """Send whatever is queued and stop the sender thread."""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+        logging.info(f"Alert dispatcher stats: {self.stats}")
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._send(self._digest(batch))
+
+    def _digest(self, messages):
+        if len(messages) == 1:
+            return messages[0]
+        shown = messages[:self.max_digest_lines]
+        lines = [f"{len(messages)} brand monitoring alerts:"] + [f"- {m}" for m in shown]
+        if len(messages) > len(shown):
+            lines.append(f"- ... and {len(messages) - len(shown)} more")
+        return "\n\n".join(lines)
+
+    def _send(self, text):
+        payload = {"text": text}
+        for attempt in range(self.max_retries + 1):
+            wait = self._next_post - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self._next_post = time.monotonic() + self.min_interval
+            delay = self.backoff * (2 ** attempt)
+            try:
+                response = requests.post(self.webhook, json=payload, timeout=self.timeout)
+                if 200 <= response.status_code < 300:
+                    self.stats["sent"] += 1
+                    return True
+                if response.status_code != 429 and response.status_code < 500:
+                    logging.error(f"Failed to send alert: {response.status_code}, {response.text[:200]}")
+                    break
+                retry_after = response.headers.get("Retry-After")
+                if retry_after and retry_after.isdigit():
+                    delay = max(delay, float(retry_after))
+                logging.warning(f"Alert webhook returned {response.status_code}, retrying in {delay:.1f}s")
+            except Exception as e:
+                logging.warning(f"Alert webhook unreachable ({e}), retrying in {delay:.1f}s")
+            if attempt < self.max_retries:
+                time.sleep(delay)
+        self.stats["failed"] += 1
+        return False
+
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+def configure_alerts(**kwargs) -> AlertDispatcher:
+    """Start the shared dispatcher with AlertDispatcher options (replacing any running one)."""
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is not None:
+            _dispatcher.close()
+        _dispatcher = AlertDispatcher(**kwargs).start()
+        return _dispatcher
+
+
+def shutdown_alerts():
+    """Flush queued alerts and stop the shared dispatcher."""
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is not None:
+            _dispatcher.close()
+            _dispatcher = None
+
 
-def send_teams_alert(message):
-    payload = {"text": message}
-    response = requests.post(TEAMS_WEBHOOK, json=payload)
-    if response.status_code != 200:
-        print(f"Failed to send alert: {response.status_code}, {response.text}")
+def send_teams_alert(message, key=None):
+    """Queue a Teams alert without blocking; alerts with the same key are deduplicated."""
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = AlertDispatcher().start()
+        dispatcher = _dispatcher
+    return dispatcher.submit(message, key=key)
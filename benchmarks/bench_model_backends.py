@@ -0,0 +1,66 @@
+"""
+Cold start and per-text latency of the scorer encoder for each backend.
+
+Usage:
+    python benchmarks/bench_model_backends.py [--backends torch int8 onnx onnx-int8] [--n 200]
+
+Each backend is measured in a fresh interpreter so cold start includes the
+sentence-transformers import and the model load.
+"""
+import argparse
+import json
+import pathlib
+import subprocess
+import sys
+import time
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+TEMPLATES = ["BRAND_PLACEHOLDER is giving away", "Update your BRAND_PLACEHOLDER profile"]
+TEXT = "BRAND_PLACEHOLDER is giving away free airtime, log in to claim your reward today"
+
+
+def _child(backend, n):
+    t0 = time.perf_counter()
+    import scorer
+    scorer.configure(backend=backend)
+    scorer.semantic_similarity(TEXT, TEMPLATES)
+    cold = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for _ in range(n):
+        score = scorer.semantic_similarity(TEXT, TEMPLATES, threshold=0.0)
+    per_text = (time.perf_counter() - t0) / n
+    # scorer.BACKEND is the backend actually loaded (torch after a failed int8/onnx load)
+    print(json.dumps({"backend": scorer.BACKEND, "requested": backend, "cold_start_s": cold, "per_text_ms": per_text * 1000, "score": score}))
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--backends", nargs="+", default=["torch", "int8", "onnx", "onnx-int8"])
+    p.add_argument("--n", type=int, default=200)
+    p.add_argument("--child", help=argparse.SUPPRESS)
+    args = p.parse_args()
+
+    if args.child:
+        _child(args.child, args.n)
+        return
+
+    print(f"{'backend':<10} {'cold start':>12} {'per text':>12} {'score':>8}")
+    for backend in args.backends:
+        proc = subprocess.run([sys.executable, __file__, "--child", backend, "--n", str(args.n)],
+                              capture_output=True, text=True, cwd=PROJECT_ROOT)
+        if proc.returncode != 0:
+            print(f"{backend:<10} failed: {proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else proc.returncode}")
+            continue
+        r = json.loads(proc.stdout.strip().splitlines()[-1])
+        if r["backend"] != backend:
+            print(f"{backend:<10} failed to load, fell back to {r['backend']} - not measured")
+            continue
+        print(f"{backend:<10} {r['cold_start_s']:>11.2f}s {r['per_text_ms']:>10.2f}ms {r['score']:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
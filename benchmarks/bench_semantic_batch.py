@@ -0,0 +1,57 @@
+"""
+Throughput comparison: per-text semantic_similarity vs semantic_similarity_batch.
+
+Usage:
+    python benchmarks/bench_semantic_batch.py [--n 256] [--batch-size 32]
+
+Loads the real sentence-transformers model, so run it outside the test suite.
+"""
+import argparse
+import pathlib
+import random
+import sys
+import time
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import scorer
+
+TEMPLATES = ["BRAND_PLACEHOLDER is giving away", "Update your BRAND_PLACEHOLDER profile"]
+WORDS = ("free airtime login verify account bonus winner claim update profile secure "
+         "gardening weather football recipe holiday BRAND_PLACEHOLDER promo reward").split()
+
+
+def _texts(n, seed=0):
+    rnd = random.Random(seed)
+    return [" ".join(rnd.choice(WORDS) for _ in range(rnd.randint(8, 60))) for _ in range(n)]
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--n", type=int, default=256)
+    p.add_argument("--batch-size", type=int, default=32)
+    args = p.parse_args()
+
+    texts = _texts(args.n)
+    # warm up model and template matrix so neither path pays the first-call cost
+    scorer.semantic_similarity_batch(texts[:4], TEMPLATES)
+
+    t0 = time.perf_counter()
+    single = [scorer.semantic_similarity(t, TEMPLATES) for t in texts]
+    t_single = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    batched = scorer.semantic_similarity_batch(texts, TEMPLATES, batch_size=args.batch_size)
+    t_batch = time.perf_counter() - t0
+
+    max_diff = max(abs(a - b) for a, b in zip(single, batched))
+    print(f"texts={args.n} batch_size={args.batch_size}")
+    print(f"per-text : {t_single:8.3f}s  {args.n / t_single:8.1f} texts/s")
+    print(f"batched  : {t_batch:8.3f}s  {args.n / t_batch:8.1f} texts/s")
+    print(f"speedup  : {t_single / t_batch:8.2f}x  (max score diff {max_diff:.2e})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Microbenchmark: per-link is_typosquat loop vs best_typosquat_matches (cdist).
+
+Usage:
+    python benchmarks/bench_typosquat.py [--links 10000] [--officials 500] [--workers -1]
+"""
+import argparse
+import pathlib
+import random
+import string
+import sys
+import time
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from utils import is_typosquat, best_typosquat_matches
+
+
+def _domain(rnd):
+    label = "".join(rnd.choice(string.ascii_lowercase) for _ in range(rnd.randint(5, 14)))
+    return label + rnd.choice([".com", ".org", ".net", ".co.ke", ".xyz"])
+
+
+def _typo(rnd, domain):
+    i = rnd.randrange(len(domain.split(".")[0]))
+    return domain[:i] + rnd.choice(string.ascii_lowercase) + domain[i + 1:]
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--links", type=int, default=10000)
+    p.add_argument("--officials", type=int, default=500)
+    p.add_argument("--workers", type=int, default=-1)
+    args = p.parse_args()
+
+    rnd = random.Random(0)
+    officials = [_domain(rnd) for _ in range(args.officials)]
+    # ~10% of links are one-character typos of an official domain
+    links = [_typo(rnd, rnd.choice(officials)) if rnd.random() < 0.1 else _domain(rnd) for _ in range(args.links)]
+
+    t0 = time.perf_counter()
+    loop = [is_typosquat(d, officials) for d in links]
+    t_loop = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    batch = [m is not None for m, _ in best_typosquat_matches(links, officials, workers=args.workers)]
+    t_batch = time.perf_counter() - t0
+
+    assert loop == batch, "batch and per-link results differ"
+    print(f"links={args.links} officials={args.officials} flagged={sum(batch)}")
+    print(f"is_typosquat loop : {t_loop:8.3f}s")
+    print(f"cdist batch       : {t_batch:8.3f}s  ({t_loop / t_batch:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
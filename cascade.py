@@ -0,0 +1,55 @@
+# cascade.py
+import logging
+import threading
+
+
+class RiskCascade:
+    """
+    Staged risk evaluation: cheap signals first, expensive ones only when needed.
+
+    Each stage is (name, threshold, fn). Stages run in order on a shared context
+    dict; fn(ctx) may add signals and raise ctx["risk"]. A stage runs only when
+    the running risk has reached its threshold - otherwise the URL is pruned
+    there and no later stage runs. Per-stage run / pruned counts are kept so the
+    savings on the benign long tail are visible.
+    """
+
+    def __init__(self, stages):
+        self.stages = list(stages)
+        self._lock = threading.Lock()
+        self._counts = {name: {"run": 0, "pruned": 0} for name, _, _ in self.stages}
+
+    @classmethod
+    def from_config(cls, stage_config, registry):
+        """
+        Build from a config list of {name, threshold} entries, in order.
+        Unknown stage names are skipped with a warning.
+        """
+        stages = []
+        for entry in stage_config:
+            name = entry.get("name")
+            if name not in registry:
+                logging.warning(f"RiskCascade: unknown stage {name!r} ignored.")
+                continue
+            stages.append((name, float(entry.get("threshold", 0.0)), registry[name]))
+        return cls(stages)
+
+    def run(self, ctx: dict) -> dict:
+        ctx.setdefault("risk", 0.0)
+        ctx["pruned_at"] = None
+        for name, threshold, fn in self.stages:
+            if ctx["risk"] < threshold:
+                ctx["pruned_at"] = name
+                self._count(name, "pruned")
+                break
+            fn(ctx)
+            self._count(name, "run")
+        return ctx
+
+    def _count(self, name, key):
+        with self._lock:
+            self._counts[name][key] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {name: dict(c) for name, c in self._counts.items()}
@@ -0,0 +1,86 @@
+# confusables.py
+import typing
+import unicodedata
+
+from enrich_cache import registrable_domain
+
+# Single-character homoglyphs folded to their Latin look-alike. A practical
+# subset of the Unicode TR39 confusables table for characters that are valid
+# in IDN labels, plus the ASCII digit swaps typosquatters use.
+_CONFUSABLE_CHARS = {
+    # Cyrillic
+    "а": "a", "Ь": "b", "ь": "b", "с": "c", "ԁ": "d", "е": "e", "ё": "e", "һ": "h",
+    "і": "i", "ї": "i", "ј": "j", "к": "k", "ӏ": "l", "м": "m", "н": "h", "о": "o",
+    "р": "p", "ԛ": "q", "г": "r", "ѕ": "s", "т": "t", "у": "y", "ԝ": "w", "х": "x",
+    # Greek
+    "α": "a", "β": "b", "ε": "e", "η": "n", "ι": "i", "κ": "k", "ν": "v", "ο": "o",
+    "ρ": "p", "τ": "t", "υ": "u", "χ": "x", "ω": "w", "ϲ": "c",
+    # Latin look-alikes
+    "ı": "i", "ȷ": "j", "ł": "l", "ɑ": "a", "ɡ": "g", "ɩ": "i", "ʟ": "l", "ꞁ": "l",
+    # ASCII digit substitutions
+    "0": "o", "1": "l", "3": "e", "5": "s", "7": "t", "8": "b",
+}
+
+# Multi-character sequences that render like a single letter
+_CONFUSABLE_SEQUENCES = (("rn", "m"), ("vv", "w"), ("cl", "d"))
+
+
+def _decode_label(label: str) -> str:
+    if label.startswith("xn--"):
+        try:
+            return label[4:].encode("ascii").decode("punycode")
+        except Exception:
+            return label
+    return label
+
+
+def skeleton(domain: str) -> str:
+    """
+    Confusable skeleton of a domain: punycode labels decoded, compatibility
+    forms and diacritics removed, homoglyphs folded to Latin.
+    Two domains that render alike share a skeleton.
+    """
+    domain = (domain or "").strip().lower().rstrip(".")
+    text = ".".join(_decode_label(label) for label in domain.split("."))
+    text = unicodedata.normalize("NFKC", text).lower()
+    text = "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+    text = "".join(_CONFUSABLE_CHARS.get(c, c) for c in text)
+    for seq, repl in _CONFUSABLE_SEQUENCES:
+        text = text.replace(seq, repl)
+    return text
+
+
+def _brand_label(domain: str) -> str:
+    return registrable_domain(domain).split(".")[0]
+
+
+class SkeletonIndex:
+    """
+    Precomputed skeleton -> official domain index for lookalike detection.
+
+    Each official domain is indexed by the skeleton of the full domain and of
+    its brand label (the registrable name without the public suffix), so
+    lookup() is one or two hash probes regardless of how many domains are
+    protected. Official domains and their subdomains are never reported.
+    """
+
+    def __init__(self, official_domains: typing.Iterable[str]):
+        self.official = {d.strip().lower().rstrip(".") for d in official_domains or [] if d}
+        self._by_domain = {}
+        self._by_label = {}
+        for d in sorted(self.official):
+            self._by_domain.setdefault(skeleton(d), d)
+            self._by_label.setdefault(skeleton(_brand_label(d)), d)
+
+    def lookup(self, domain: str) -> typing.Optional[str]:
+        """Return the official domain that `domain` imitates, or None."""
+        domain = (domain or "").strip().lower().rstrip(".").split(":")[0]
+        if not domain:
+            return None
+        reg = registrable_domain(domain)
+        if reg in self.official or domain in self.official:
+            return None
+        return self._by_domain.get(skeleton(reg)) or self._by_label.get(skeleton(_brand_label(reg)))
+
+    def __len__(self):
+        return len(self.official)
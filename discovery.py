@@ -1,27 +1,14 @@
-import subprocess
-import json
 import logging
 import os
 import requests
 import whois
 import datetime
-from typing import Iterable, List, Set
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Iterable, Iterator, List, Set
 
-def generate_permutations(domain: str) -> set:
-    """
-    Generate lookalike domains using dnstwist CLI.
-    Returns a set of domain names.
-    """
-    try:
-        result = subprocess.run(
-            ["dnstwist", "--format", "json", domain],
-            capture_output=True, text=True, check=True
-        )
-        data = json.loads(result.stdout)
-        return {entry["domain-name"] for entry in data if entry.get("domain-name")}
-    except Exception as e:
-        logging.warning(f"dnstwist failed for {domain}: {e}")
-        return set()
+from permutations import DEFAULT_TLDS, iter_permutations
 
 def _simple_variants(domain: str) -> Set[str]:
     """Generate a small set of simple typosquat / suspicious variants for a domain."""
@@ -45,82 +32,198 @@ def _simple_variants(domain: str) -> Set[str]:
     variants.add(domain)
     return {v for v in variants if v}
 
-def get_suspicious_domains(official_domains: Iterable[str], suspicious_tlds: Iterable[str], whois_api_key: str = None) -> List[str]:
-    """
-    Discover potentially suspicious domains.
-    - Signature accepts optional whois_api_key for backward-compatibility but it is ignored.
-    - Uses python-whois to flag newly-registered or missing WHOIS as suspicious.
-    - Returns a list of candidate domain names (no scheme).
-    """
-    candidates = set()
-    suspicious_tlds = set(suspicious_tlds or [])
-    official_set = set(official_domains or [])
+class _RateLimiter:
+    """Per-key minimum spacing between calls, e.g. one slot per WHOIS server."""
+
+    def __init__(self, rate_per_sec: float):
+        self.interval = 1.0 / rate_per_sec if rate_per_sec and rate_per_sec > 0 else 0.0
+        self._next = {}
+        self._lock = threading.Lock()
+
+    def wait(self, key: str):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next.get(key, now))
+            self._next[key] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def _whois_server_key(domain: str) -> str:
+    """python-whois picks the WHOIS server by TLD, so rate-limit per TLD."""
+    return domain.rsplit(".", 1)[-1].lower()
+
+
+def _candidate_domains(official_set: Set[str], suspicious_tlds: Set[str], permutations: bool = False) -> Iterator[str]:
+    """Lazily yield unique candidate domains (official domains excluded)."""
+    seen = set(official_set)
+
+    def fresh(dom):
+        # normalize remove leading www. for whois checks
+        check_dom = dom[4:] if dom.startswith("www.") else dom
+        if check_dom in seen:
+            return None
+        seen.add(check_dom)
+        return check_dom
 
     # generate simple variants for each official domain
-    for d in official_set:
-        candidates.update(_simple_variants(d))
+    for d in sorted(official_set):
+        variants = set(_simple_variants(d))
 
         # generate domains by combining root label with suspicious TLDs
         parts = d.split(".")
         root = parts[0]
         for t in suspicious_tlds:
             if t.startswith("."):
-                candidates.add(f"{root}{t}")
+                variants.add(f"{root}{t}")
             else:
-                candidates.add(f"{root}.{t}")
+                variants.add(f"{root}.{t}")
+        for dom in sorted(variants):
+            check_dom = fresh(dom)
+            if check_dom:
+                yield check_dom
 
-    results = []
-    for dom in sorted(candidates):
-        # normalize remove leading www. for whois checks
-        check_dom = dom.lstrip("www.")
-        if check_dom in official_set:
-            continue
+    if permutations:
+        tlds = sorted(set(DEFAULT_TLDS) | {t.lstrip(".") for t in suspicious_tlds})
+        for dom in iter_permutations(official_set, tlds=tlds):
+            check_dom = fresh(dom)
+            if check_dom:
+                yield check_dom
+
+
+def _resolvable(candidates: Iterator[str], resolver, chunk_size: int = 500) -> Iterator[str]:
+    """Drop NXDOMAIN candidates in bulk DNS chunks before any WHOIS lookup."""
+    chunk = []
+    dropped = 0
+    for dom in candidates:
+        chunk.append(dom)
+        if len(chunk) >= chunk_size:
+            alive = resolver.filter_resolvable(chunk)
+            dropped += len(chunk) - len(alive)
+            yield from alive
+            chunk = []
+    if chunk:
+        alive = resolver.filter_resolvable(chunk)
+        dropped += len(chunk) - len(alive)
+        yield from alive
+    logging.info(f"DNS pre-filter dropped {dropped} NXDOMAIN discovery candidates.")
 
+
+def _lookup_whois(check_dom: str, limiter: _RateLimiter):
+    """Rate-limited WHOIS lookup; returns the record or the raised exception."""
+    limiter.wait(_whois_server_key(check_dom))
+    try:
+        return whois.whois(check_dom)
+    except Exception as e:
+        return e
+
+
+def _is_suspicious(check_dom: str, w, suspicious_tlds: Set[str]) -> bool:
+    if isinstance(w, Exception):
+        logging.debug(f"WHOIS lookup failed for {check_dom}: {w}", exc_info=False)
+        # if whois failed, consider it suspicious (could be unregistered or private)
+        return True
+
+    # examine creation date(s)
+    created = w.creation_date
+    creation_date = None
+    if isinstance(created, list):
+        creation_date = created[0]
+    else:
+        creation_date = created
+
+    if creation_date is None:
+        # missing creation -> suspicious
+        return True
+
+    # if creation_date is a string parse attempt
+    if isinstance(creation_date, str):
         try:
-            w = whois.whois(check_dom)
-        except Exception as e:
-            logging.debug(f"WHOIS lookup failed for {check_dom}: {e}", exc_info=False)
-            # if whois failed, consider it suspicious (could be unregistered or private)
-            results.append(check_dom)
-            continue
-
-        # examine creation date(s)
-        created = w.creation_date
-        creation_date = None
-        if isinstance(created, list):
-            creation_date = created[0]
-        else:
-            creation_date = created
-
-        if creation_date is None:
-            # missing creation -> suspicious
-            results.append(check_dom)
-            continue
-
-        # if creation_date is a string parse attempt
-        if isinstance(creation_date, str):
+            creation_date = datetime.datetime.fromisoformat(creation_date)
+        except Exception:
             try:
-                creation_date = datetime.datetime.fromisoformat(creation_date)
+                creation_date = datetime.datetime.strptime(creation_date, "%Y-%m-%d")
             except Exception:
-                try:
-                    creation_date = datetime.datetime.strptime(creation_date, "%Y-%m-%d")
-                except Exception:
-                    creation_date = None
-
-        if creation_date:
-            age_days = (datetime.datetime.utcnow() - creation_date).days
-            if age_days < 90:
-                results.append(check_dom)
-                continue
-
-        # also flag if TLD is in suspicious list
-        dom_tld = "." + check_dom.split(".")[-1]
-        if dom_tld in suspicious_tlds:
-            if check_dom not in results:
-                results.append(check_dom)
-
-    # dedupe and return
-    return sorted(set(results))
+                creation_date = None
+
+    if creation_date:
+        age_days = (datetime.datetime.utcnow() - creation_date).days
+        if age_days < 90:
+            return True
+
+    # also flag if TLD is in suspicious list
+    dom_tld = "." + check_dom.split(".")[-1]
+    return dom_tld in suspicious_tlds
+
+
+def iter_suspicious_domains(official_domains: Iterable[str], suspicious_tlds: Iterable[str],
+                            workers: int = 8, whois_rate_per_server: float = 1.0,
+                            permutations: bool = False, resolver=None) -> Iterator[str]:
+    """
+    Concurrent discovery sweep: yields candidate domains (no scheme) as soon as
+    their WHOIS check judges them suspicious. Lookups run on `workers` threads,
+    at most `whois_rate_per_server` per second against each WHOIS server.
+    Candidates are de-duplicated up front, so each domain is looked up once.
+    With permutations=True the full permutation engine feeds the sweep; the
+    candidate stream is consumed lazily so only a few lookups are queued at once.
+    A resolver.BulkResolver, when given, drops NXDOMAIN candidates before WHOIS;
+    permutations are only used together with a resolver.
+    """
+    suspicious_tlds = set(suspicious_tlds or [])
+    official_set = set(official_domains or [])
+    limiter = _RateLimiter(whois_rate_per_server)
+    workers = max(1, workers)
+    if permutations and resolver is None:
+        # without the NXDOMAIN filter every permutation would go to WHOIS at ~1/s per TLD
+        logging.warning("Permutation discovery needs the DNS pre-filter (dns.enabled and dnspython); using simple variants only.")
+        permutations = False
+    candidates = _candidate_domains(official_set, suspicious_tlds, permutations=permutations)
+    if resolver is not None:
+        candidates = _resolvable(candidates, resolver)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = {}
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < workers * 4:
+                dom = next(candidates, None)
+                if dom is None:
+                    exhausted = True
+                    break
+                pending[executor.submit(_lookup_whois, dom, limiter)] = dom
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                dom = pending.pop(future)
+                if _is_suspicious(dom, future.result(), suspicious_tlds):
+                    yield dom
+
+
+def get_suspicious_domains(official_domains: Iterable[str], suspicious_tlds: Iterable[str], whois_api_key: str = None,
+                           on_suspicious: Callable[[str], None] = None, workers: int = 8,
+                           whois_rate_per_server: float = 1.0,
+                           permutations: bool = False, resolver=None) -> List[str]:
+    """
+    Discover potentially suspicious domains.
+    - Signature accepts optional whois_api_key for backward-compatibility but it is ignored.
+    - Uses python-whois to flag newly-registered or missing WHOIS as suspicious.
+    - on_suspicious(domain) is called for each hit as it is found, so callers can
+      stream candidates into the frontier while the sweep is still running.
+    - permutations=True adds the in-process permutation engine's candidates (requires resolver).
+    - resolver (resolver.BulkResolver) drops candidates with no DNS before WHOIS.
+    - Returns a list of candidate domain names (no scheme).
+    """
+    results = set()
+    for dom in iter_suspicious_domains(official_domains, suspicious_tlds, workers=workers,
+                                       whois_rate_per_server=whois_rate_per_server,
+                                       permutations=permutations, resolver=resolver):
+        results.add(dom)
+        if on_suspicious is not None:
+            on_suspicious(dom)
+    return sorted(results)
 
 def fetch_new_domains(api_key: str, keyword: str) -> set:
     """
@@ -0,0 +1,158 @@
+# embedding_cache.py
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+
+import numpy as np
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    slot INTEGER NOT NULL UNIQUE,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_lru ON entries(last_used);
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+
+def normalize_text(text):
+    """Unicode NFC with whitespace collapsed - the form the cache key is computed on."""
+    return " ".join(unicodedata.normalize("NFC", text or "").split())
+
+
+def cache_key(model, text):
+    return hashlib.sha256(f"{model}\0{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Content-addressed, persistent embedding cache.
+
+    Vectors live in a fixed-size memory-mapped float32 file (<path>.f32) with
+    `capacity` slots; a SQLite index (<path>.db) maps sha256(model, normalized
+    text) to a slot and its last-use time. When full, the least recently used
+    slot is reused. Vectors are flushed before the index commits, so an index
+    entry never points at an unwritten slot. All methods are thread-safe.
+    """
+
+    def __init__(self, path="embedding_cache", capacity=100000):
+        self.path = path
+        self.capacity = int(capacity)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._vectors = None
+        self._conn = sqlite3.connect(path + ".db", check_same_thread=False, isolation_level=None)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+            row = self._conn.execute("SELECT value FROM meta WHERE name='dim'").fetchone()
+            if row is not None:
+                self._open_vectors(int(row[0]))
+
+    def _open_vectors(self, dim):
+        vec_path = self.path + ".f32"
+        shape = (self.capacity, dim)
+        expected = self.capacity * dim * 4
+        mode = "r+" if os.path.exists(vec_path) and os.path.getsize(vec_path) == expected else "w+"
+        if mode == "w+":
+            # new file, or capacity/dimension changed: existing index entries are meaningless
+            self._conn.execute("DELETE FROM entries")
+        self._vectors = np.memmap(vec_path, dtype=np.float32, mode=mode, shape=shape)
+        self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('dim', ?)", (str(dim),))
+
+    def _slots(self, keys):
+        """{key: slot} for the keys present in the index (caller holds the lock)."""
+        slots = {}
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            slots.update(self._conn.execute(
+                f"SELECT key, slot FROM entries WHERE key IN ({', '.join('?' * len(chunk))})", chunk
+            ).fetchall())
+        return slots
+
+    def get_many(self, keys):
+        """{key: vector} for the keys present; hits are marked as recently used."""
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        found = {}
+        with self._lock:
+            if self._vectors is not None:
+                for key, slot in self._slots(keys).items():
+                    found[key] = np.array(self._vectors[slot])
+                if found:
+                    now = time.time()
+                    self._conn.executemany("UPDATE entries SET last_used=? WHERE key=?", ((now, k) for k in found))
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, keys, vectors):
+        """Store vectors (n, dim) under keys, evicting least recently used entries when full."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if not len(keys):
+            return
+        with self._lock:
+            if self._vectors is None or self._vectors.shape[1] != vectors.shape[1]:
+                if self._vectors is not None:
+                    logging.warning("EmbeddingCache: embedding dimension changed, clearing cache.")
+                    self._vectors = None
+                    os.remove(self.path + ".f32")
+                self._open_vectors(vectors.shape[1])
+            pending = dict(zip(keys, vectors))
+            existing = self._slots(list(pending))
+            used = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            free = iter(range(used, self.capacity))
+            evict = []
+            slots = {}
+            for key in pending:
+                if key in existing:
+                    slots[key] = existing[key]
+                    continue
+                slot = next(free, None)
+                if slot is None:
+                    evict.append(key)
+                else:
+                    slots[key] = slot
+            if evict:
+                # reuse the least recently used slots (never ones written in this call);
+                # victims are dropped from the index before their slots are overwritten
+                victims = self._conn.execute(
+                    "SELECT key, slot FROM entries ORDER BY last_used LIMIT ?", (len(evict) + len(slots),)
+                ).fetchall()
+                taken = set(slots.values())
+                victims = [(k, s) for k, s in victims if s not in taken and k not in pending][:len(evict)]
+                self._conn.executemany("DELETE FROM entries WHERE key=?", ((k,) for k, _ in victims))
+                for key, (_, slot) in zip(evict, victims):
+                    slots[key] = slot
+            for key, slot in slots.items():
+                self._vectors[slot] = pending[key]
+            self._vectors.flush()
+            now = time.time()
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?)", ((k, s, now) for k, s in slots.items())
+            )
+            self._conn.execute("COMMIT")
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+    def close(self):
+        with self._lock:
+            if self._vectors is not None:
+                self._vectors.flush()
+                self._vectors = None
+            self._conn.close()
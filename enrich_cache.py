@@ -0,0 +1,124 @@
+# enrich_cache.py
+import json
+import logging
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+
+try:
+    import tldextract
+except Exception:
+    tldextract = None
+    logging.warning("tldextract not available - enrichment cache keys fall back to the last two host labels.")
+
+_SECOND_LEVEL = {"co", "com", "net", "org", "ac", "gov", "go", "or", "ne", "edu"}
+
+DEFAULT_TTLS = {"whois": 7 * 86400, "ssl": 86400}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS enrichment (
+    kind TEXT NOT NULL,
+    domain TEXT NOT NULL,
+    value TEXT NOT NULL,
+    is_error INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (kind, domain)
+);
+"""
+
+
+def registrable_domain(host: str) -> str:
+    """Registrable domain (eTLD+1) for a host, e.g. login.secure.example.co.uk -> example.co.uk."""
+    host = (host or "").strip().lower().rstrip(".")
+    host = host.split("@")[-1].split(":")[0]
+    if tldextract is not None:
+        ext = tldextract.extract(host)
+        if hasattr(ext, "top_domain_under_public_suffix"):
+            reg = ext.top_domain_under_public_suffix
+        else:
+            reg = ext.registered_domain
+        return reg or host
+    labels = host.split(".")
+    # rough fallback: treat co.ke / com.au style second-level suffixes as public
+    keep = 3 if len(labels) > 2 and len(labels[-1]) == 2 and labels[-2] in _SECOND_LEVEL else 2
+    return ".".join(labels[-keep:]) if len(labels) > keep else host
+
+
+class EnrichmentCache:
+    """
+    Persistent TTL cache for WHOIS / SSL lookups keyed by registrable domain.
+
+    get(kind, domain, fn) returns a cached value or calls fn(domain) once.
+    Concurrent lookups of the same (kind, registrable domain) are merged into
+    a single call. Results that are error dicts ({"error": ...}) or raise are
+    cached for negative_ttl seconds so a failing host is not retried per page.
+    """
+
+    def __init__(self, path="enrichment_cache.db", ttls=None, negative_ttl=900):
+        self.path = path
+        self.ttls = dict(DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self.negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._stats = {}
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+
+    def _count(self, kind, name):
+        counters = self._stats.setdefault(kind, {"hits": 0, "misses": 0, "errors": 0, "coalesced": 0})
+        counters[name] += 1
+
+    def get(self, kind, domain, fn):
+        key = registrable_domain(domain)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM enrichment WHERE kind=? AND domain=?", (kind, key)
+            ).fetchone()
+            if row and row[1] > time.time():
+                self._count(kind, "hits")
+                return json.loads(row[0])
+            fut = self._inflight.get((kind, key))
+            leader = fut is None
+            if leader:
+                self._count(kind, "misses")
+                fut = self._inflight[(kind, key)] = Future()
+            else:
+                self._count(kind, "coalesced")
+        if not leader:
+            return fut.result()
+
+        try:
+            value = fn(domain)
+        except Exception as e:
+            logging.warning(f"EnrichmentCache: {kind} lookup failed for {domain}: {e}")
+            value = {"error": str(e)}
+        is_error = isinstance(value, dict) and "error" in value
+        ttl = self.negative_ttl if is_error else self.ttls.get(kind, 3600)
+        with self._lock:
+            if is_error:
+                self._count(kind, "errors")
+            self._conn.execute(
+                "INSERT OR REPLACE INTO enrichment VALUES (?, ?, ?, ?, ?)",
+                (kind, key, json.dumps(value, default=str), int(is_error), time.time() + ttl),
+            )
+            del self._inflight[(kind, key)]
+        fut.set_result(value)
+        return value
+
+    def stats(self) -> dict:
+        """Per-kind hit / miss / error / coalesced counters."""
+        with self._lock:
+            return {kind: dict(c) for kind, c in self._stats.items()}
+
+    def purge_expired(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM enrichment WHERE expires_at <= ?", (time.time(),))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
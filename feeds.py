@@ -0,0 +1,60 @@
+# feeds.py
+import csv
+import json
+import logging
+import os
+
+PHISHTANK_URL = "https://data.phishtank.com/data/online-valid.csv"
+
+
+def _load_meta(path) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            return json.load(fh)
+    except Exception:
+        return {}
+
+
+def stream_phishtank(session, url=PHISHTANK_URL, cache_path="phishtank_online-valid.csv", timeout=30):
+    """
+    Stream PhishTank rows (dicts) using a conditional GET against a local copy.
+
+    If-None-Match / If-Modified-Since are sent from the previous download's
+    validators; a 304 means the feed is unchanged and nothing is yielded. On a
+    200 the body is read line by line: each line is appended to a temporary
+    copy and parsed immediately, so rows are yielded while the download is
+    still running and the body is never held in memory. The cached copy and
+    validators are replaced only once the download completes.
+    """
+    meta_path = cache_path + ".meta.json"
+    meta = _load_meta(meta_path)
+    headers = {}
+    if os.path.exists(cache_path):
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    with session.get(url, headers=headers, timeout=timeout, stream=True) as r:
+        if r.status_code == 304:
+            logging.info(f"PhishTank feed unchanged since {meta.get('last_modified') or meta.get('etag')}.")
+            return
+        r.raise_for_status()
+        r.encoding = r.encoding or "utf-8"
+        tmp_path = cache_path + ".part"
+        complete = False
+        try:
+            with open(tmp_path, "w", encoding="utf-8", newline="") as fh:
+                def lines():
+                    for line in r.iter_lines(decode_unicode=True):
+                        fh.write(line + "\n")
+                        yield line
+                yield from csv.DictReader(lines())
+            complete = True
+        finally:
+            if complete:
+                os.replace(tmp_path, cache_path)
+                with open(meta_path, "w", encoding="utf-8") as fh:
+                    json.dump({"etag": r.headers.get("ETag"), "last_modified": r.headers.get("Last-Modified")}, fh)
+            elif os.path.exists(tmp_path):
+                os.remove(tmp_path)
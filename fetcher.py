@@ -1,62 +1,356 @@
 # fetcher.py
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 import time
 import os
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
+from concurrent.futures import Future
+from contextlib import contextmanager
+import asyncio
 import pathlib, logging
+import queue
+import threading
+
+try:
+    import aiohttp
+except Exception:
+    aiohttp = None
+    logging.warning("aiohttp not available - safe_get will fall back to a pooled requests.Session. Install aiohttp for the async fetch engine.")
+
+USER_AGENT = "BrandMonitorBot/1.0 (+your-email@example.com)"
+
+
+class AsyncFetcher:
+    """
+    asyncio HTTP fetch engine with pooled keep-alive connections.
+
+    Runs its own event loop on a background thread so the sync crawler can
+    submit(url) from any thread and get a concurrent.futures.Future. Total
+    in-flight requests are capped by `concurrency` and connections per host by
+    `per_host`. Results use the same dict shape as safe_get.
+    """
+
+    def __init__(self, concurrency: int = 200, per_host: int = 8, timeout: float = 10, max_bytes: int = 2_000_000):
+        if aiohttp is None:
+            raise RuntimeError("AsyncFetcher requires aiohttp")
+        self.concurrency = max(1, int(concurrency))
+        self.per_host = max(1, int(per_host))
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self._loop = None
+        self._thread = None
+        self._session = None
+
+    def start(self):
+        if self._thread is not None:
+            return self
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="async-fetcher", daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._open(), self._loop).result()
+        return self
+
+    async def _open(self):
+        connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.per_host, ttl_dns_cache=300)
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers={"User-Agent": USER_AGENT},
+        )
+
+    async def fetch_async(self, url: str) -> dict:
+        try:
+            async with self._session.get(url, allow_redirects=True) as r:
+                # read to EOF, but cap the body so a huge download can't stall a connection slot
+                chunks, size = [], 0
+                async for chunk in r.content.iter_chunked(64 * 1024):
+                    chunks.append(chunk)
+                    size += len(chunk)
+                    if size >= self.max_bytes:
+                        break
+                raw = b"".join(chunks)[:self.max_bytes]
+                text = raw.decode(r.charset or "utf-8", errors="replace")
+                return {"status": r.status, "text": text, "final_url": str(r.url), "headers": dict(r.headers)}
+        except Exception as e:
+            logging.warning(f"AsyncFetcher failed for {url}: {e!r}")
+            return {"error": str(e) or repr(e)}
+
+    def submit(self, url: str) -> Future:
+        return asyncio.run_coroutine_threadsafe(self.fetch_async(url), self._loop)
+
+    def fetch(self, url: str) -> dict:
+        return self.submit(url).result()
+
+    def fetch_many(self, urls) -> list:
+        futures = [self.submit(u) for u in urls]
+        return [f.result() for f in futures]
+
+    def close(self):
+        if self._thread is None:
+            return
+        if self._session is not None:
+            asyncio.run_coroutine_threadsafe(self._session.close(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._thread = None
+
+
+_fetcher = None
+_fetcher_lock = threading.Lock()
+_session = None
+_session_lock = threading.Lock()
+
+
+def configure_fetcher(concurrency: int = 200, per_host: int = 8, timeout: float = 10):
+    """Start the shared AsyncFetcher used by safe_get. Returns None if aiohttp is unavailable."""
+    global _fetcher
+    with _fetcher_lock:
+        if _fetcher is not None:
+            _fetcher.close()
+            _fetcher = None
+        if aiohttp is None:
+            return None
+        _fetcher = AsyncFetcher(concurrency=concurrency, per_host=per_host, timeout=timeout).start()
+        return _fetcher
+
+
+def shutdown_fetcher():
+    global _fetcher
+    with _fetcher_lock:
+        if _fetcher is not None:
+            _fetcher.close()
+            _fetcher = None
+
+
+def http_session() -> requests.Session:
+    """Shared requests.Session so sync callers reuse connections and TLS sessions."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+            _session.headers["User-Agent"] = USER_AGENT
+        return _session
+
 
 def safe_get(url, timeout=10):
-    """Fetch URL with safe error handling."""
-    headers = {"User-Agent": "BrandMonitorBot/1.0 (+your-email@example.com)"}
+    """Fetch URL with safe error handling. Uses the shared AsyncFetcher when configured."""
+    engine = _fetcher
+    if engine is not None:
+        return engine.fetch(url)
     try:
-        r = requests.get(url, headers=headers, timeout=timeout, allow_redirects=True)
+        r = http_session().get(url, timeout=timeout, allow_redirects=True)
         return {"status": r.status_code, "text": r.text, "final_url": r.url, "headers": dict(r.headers)}
     except Exception as e:
         logging.warning(f"safe_get failed for {url}: {e}", exc_info=True)
         return {"error": str(e)}
 
-def extract_links(html, base):
-    """Extract all links from HTML."""
-    soup = BeautifulSoup(html, "html.parser")
+try:
+    import lxml  # noqa: F401
+    DEFAULT_PARSER = "lxml"
+except Exception:
+    DEFAULT_PARSER = "html.parser"
+
+_parsers = {}
+
+
+def _resolve_parser(parser):
+    """The configured BeautifulSoup backend, or DEFAULT_PARSER (warning once) when it is not installed."""
+    if not parser:
+        return DEFAULT_PARSER
+    if parser not in _parsers:
+        from bs4.builder import builder_registry
+        if builder_registry.lookup(parser) is None:
+            logging.warning(f"HTML parser {parser!r} is not available; using {DEFAULT_PARSER!r}.")
+            _parsers[parser] = DEFAULT_PARSER
+        else:
+            _parsers[parser] = parser
+    return _parsers[parser]
+
+# elements whose text is never rendered as page content
+_INVISIBLE_TAGS = ["script", "style", "noscript", "template", "svg", "head"]
+
+
+def parse_page(html, base, parser=None) -> dict:
+    """
+    Parse HTML once and return {"title", "text", "links"}.
+    text is the visible page text with whitespace collapsed; links are the
+    outbound http(s) anchors resolved against base. parser is any BeautifulSoup
+    backend name; it defaults to lxml when installed and falls back to
+    DEFAULT_PARSER when the requested backend is missing.
+    """
+    soup = BeautifulSoup(html or "", _resolve_parser(parser))
+    title = soup.title.get_text(strip=True) if soup.title else ""
     links = set()
     for a in soup.find_all("a", href=True):
-        links.add(urljoin(base, a["href"]))
-    return list(links)
+        link = urljoin(base, a["href"])
+        if urlparse(link).scheme in ("http", "https"):
+            links.add(link)
+    for tag in soup(_INVISIBLE_TAGS):
+        tag.decompose()
+    text = " ".join(soup.get_text(" ", strip=True).split())
+    return {"title": title, "text": text, "links": list(links)}
 
-def take_screenshot(url: str, out_dir: str = "screenshots", timeout: int = 15) -> str:
-    """Take a screenshot of a URL using headless Chrome."""
-    out_dir = pathlib.Path(out_dir)
-    out_dir.mkdir(parents=True, exist_ok=True)
-    safe_name = url.replace("://", "_").replace("/", "_").replace("?", "_")
-    filename = out_dir / f"{int(time.time())}_{safe_name}.png"
+def extract_links(html, base):
+    """Extract all links from HTML."""
+    return parse_page(html, base)["links"]
+
+_driver_path = None
+_driver_path_lock = threading.Lock()
+
+
+def chromedriver_path() -> str:
+    """Resolve the chromedriver binary once per process."""
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path is None:
+            from webdriver_manager.chrome import ChromeDriverManager
+            _driver_path = ChromeDriverManager().install()
+        return _driver_path
 
+
+def _chrome_options():
+    from selenium.webdriver.chrome.options import Options
     options = Options()
     options.add_argument("--headless=new")
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-dev-shm-usage")
     options.add_argument("--window-size=1366,768")
+    # return from get() at DOMContentLoaded; take_screenshot waits for readyState itself
+    options.page_load_strategy = "eager"
+    return options
+
 
-    driver = None
+def _is_page_timeout(e) -> bool:
     try:
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=options)
-        driver.set_page_load_timeout(timeout)
-        driver.get(url)
-        time.sleep(1)
-        driver.save_screenshot(str(filename))
+        from selenium.common.exceptions import TimeoutException
+    except Exception:
+        return False
+    return isinstance(e, TimeoutException)
+
+
+class BrowserPool:
+    """
+    Bounded pool of long-lived headless Chrome sessions.
+    A session is handed to one scan worker at a time and is recycled after
+    max_pages screenshots or as soon as it raises a WebDriver error.
+    """
+
+    def __init__(self, size: int = 2, max_pages: int = 50):
+        self.size = max(1, int(size))
+        self.max_pages = max(1, int(max_pages))
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._closed = False
+
+    def _new_driver(self):
+        # Selenium is imported on first use so the HTTP side of this module works without it
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+        service = Service(chromedriver_path())
+        return webdriver.Chrome(service=service, options=_chrome_options())
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    @contextmanager
+    def session(self):
+        """Yield a driver from the pool, blocking while all sessions are busy."""
+        self._slots.acquire()
+        driver, pages = None, 0
+        try:
+            try:
+                driver, pages = self._idle.get_nowait()
+            except queue.Empty:
+                driver = self._new_driver()
+            yield driver
+            pages += 1
+        except Exception as e:
+            if _is_page_timeout(e):
+                # slow page, the browser itself is fine
+                pages += 1
+                raise
+            if driver is not None:
+                self._quit(driver)
+                driver = None
+            raise
+        finally:
+            if driver is not None:
+                if self._closed or pages >= self.max_pages:
+                    self._quit(driver)
+                else:
+                    self._idle.put((driver, pages))
+            self._slots.release()
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                driver, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._quit(driver)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def configure_browser_pool(size: int = 2, max_pages: int = 50) -> BrowserPool:
+    """Replace the shared screenshot pool (closing the previous one)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+        _pool = BrowserPool(size=size, max_pages=max_pages)
+        return _pool
+
+
+def get_browser_pool() -> BrowserPool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool()
+        return _pool
+
+
+def shutdown_browser_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
+def take_screenshot(url: str, out_dir: str = "screenshots", timeout: int = 15, pool: BrowserPool = None) -> str:
+    """Take a screenshot of a URL using a pooled headless Chrome session."""
+    out_dir = pathlib.Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    safe_name = url.replace("://", "_").replace("/", "_").replace("?", "_")
+    filename = out_dir / f"{int(time.time())}_{safe_name}.png"
+
+    pool = pool or get_browser_pool()
+    try:
+        from selenium.webdriver.support.ui import WebDriverWait
+        with pool.session() as driver:
+            driver.set_page_load_timeout(timeout)
+            driver.get(url)
+            WebDriverWait(driver, timeout).until(
+                lambda d: d.execute_script("return document.readyState") == "complete"
+            )
+            driver.save_screenshot(str(filename))
+            # don't leak cookies/session state into the next page on this browser
+            driver.delete_all_cookies()
         logging.info(f"Screenshot saved: {filename}")
         return str(filename)
     except Exception as e:
         logging.warning(f"Screenshot failed for {url}: {e}", exc_info=True)
         return ""
-    finally:
-        if driver:
-            try:
-                driver.quit()
-            except Exception:
-                pass
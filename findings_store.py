@@ -0,0 +1,212 @@
+# findings_store.py
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+
+try:
+    import pandas as pd
+except Exception:
+    pd = None
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS findings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    day TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    type TEXT NOT NULL,
+    url TEXT,
+    domain TEXT,
+    title TEXT,
+    keyword TEXT,
+    text TEXT,
+    similarity REAL,
+    score REAL,
+    risk REAL,
+    whois_registrar TEXT,
+    whois_created TEXT,
+    whois_expires TEXT,
+    whois_error TEXT,
+    ssl_issuer TEXT,
+    ssl_not_after TEXT,
+    ssl_error TEXT,
+    screenshot TEXT,
+    finding_id TEXT,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS findings_day ON findings(day, risk);
+CREATE INDEX IF NOT EXISTS findings_domain ON findings(domain);
+CREATE INDEX IF NOT EXISTS findings_id ON findings(finding_id);
+"""
+
+# record keys stored as-is in their own column; anything else goes to 'extra'
+_PLAIN = ("url", "domain", "title", "keyword", "text", "similarity", "score", "risk", "screenshot", "finding_id")
+
+COLUMNS = (
+    "id", "day", "created_at", "type", "url", "domain", "title", "keyword", "text",
+    "similarity", "score", "risk", "whois_registrar", "whois_created", "whois_expires",
+    "whois_error", "ssl_issuer", "ssl_not_after", "ssl_error", "screenshot", "finding_id", "extra",
+)
+
+
+def _whois_columns(who):
+    """(registrar, created, expires, error) from a WhoisXML API response or a flat whois dict."""
+    if not isinstance(who, dict):
+        return None, None, None, (str(who) if who else None)
+    if who.get("error"):
+        return None, None, None, str(who["error"])
+    rec = who.get("WhoisRecord", who)
+    reg = rec.get("registryData") or {}
+
+    def pick(*keys):
+        for src in (rec, reg):
+            for k in keys:
+                v = src.get(k)
+                if v:
+                    return str(v[0] if isinstance(v, list) else v)
+        return None
+
+    return (pick("registrarName", "registrar"),
+            pick("createdDate", "creation_date"),
+            pick("expiresDate", "expiration_date"),
+            None)
+
+
+def _ssl_columns(cert):
+    """(issuer, not_after, error) from enrich.ssl_info output."""
+    if not isinstance(cert, dict):
+        return None, None, (str(cert) if cert else None)
+    if cert.get("error"):
+        return None, None, str(cert["error"])
+    issuer = cert.get("issuer")
+    if isinstance(issuer, (list, tuple)):
+        # getpeercert() form: ((("organizationName", "X"),), (("commonName", "Y"),))
+        issuer = ", ".join(f"{k}={v}" for rdn in issuer for k, v in rdn)
+    return (issuer or None), cert.get("notAfter"), None
+
+
+def _row(record, now):
+    who = _whois_columns(record.get("whois"))
+    cert = _ssl_columns(record.get("ssl"))
+    extra = {k: v for k, v in record.items() if k not in _PLAIN and k not in ("type", "whois", "ssl")}
+    return (
+        datetime.fromtimestamp(now, timezone.utc).strftime("%Y-%m-%d"),
+        now,
+        record.get("type", "page"),
+        *(record.get(k) for k in _PLAIN[:5]),
+        *(record.get(k) for k in ("similarity", "score", "risk")),
+        *who,
+        *cert,
+        record.get("screenshot"),
+        record.get("finding_id"),
+        json.dumps(extra, default=str, ensure_ascii=False) if extra else None,
+    )
+
+
+class FindingsStore:
+    """
+    Append-only findings table in SQLite, partitioned by UTC day.
+
+    Records are buffered and written in chunks (one executemany per chunk), with
+    WHOIS / SSL / score fields flattened into typed, queryable columns instead of
+    JSON blobs. Keys without a column are kept in the 'extra' JSON column.
+    Spreadsheets are an optional export of a filtered view (see export()).
+    """
+
+    def __init__(self, path="findings.db", chunk_size=200):
+        self.path = path
+        self.chunk_size = max(1, int(chunk_size))
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+
+    def add(self, record: dict):
+        with self._lock:
+            self._buffer.append(_row(record, time.time()))
+            if len(self._buffer) >= self.chunk_size:
+                self._write()
+
+    def flush(self):
+        with self._lock:
+            self._write()
+
+    def _write(self):
+        if not self._buffer:
+            return
+        placeholders = ", ".join("?" * (len(COLUMNS) - 1))
+        self._conn.execute("BEGIN")
+        self._conn.executemany(f"INSERT INTO findings ({', '.join(COLUMNS[1:])}) VALUES ({placeholders})", self._buffer)
+        self._conn.execute("COMMIT")
+        self._buffer = []
+
+    def query(self, since=None, until=None, min_risk=None, kind=None):
+        """
+        Yield findings as flat dicts, oldest first. `since` / `until` are
+        inclusive 'YYYY-MM-DD' day partitions; `kind` filters on the type
+        column ('page', 'tweet', ...).
+        """
+        where, args = [], []
+        if since:
+            where.append("day >= ?")
+            args.append(since)
+        if until:
+            where.append("day <= ?")
+            args.append(until)
+        if min_risk is not None:
+            where.append("COALESCE(risk, score, 0) >= ?")
+            args.append(min_risk)
+        if kind:
+            where.append("type = ?")
+            args.append(kind)
+        sql = f"SELECT {', '.join(COLUMNS)} FROM findings"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute(sql + " ORDER BY id", args).fetchall()
+        for r in rows:
+            yield dict(zip(COLUMNS, r))
+
+    def count(self) -> int:
+        self.flush()
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM findings").fetchone()[0]
+
+    def export(self, path, **filters):
+        """
+        Write the filtered view (see query()) to .xlsx (needs pandas + openpyxl)
+        or .csv. Returns the absolute path written, or None.
+        """
+        rows = list(self.query(**filters))
+        if not rows:
+            logging.info("FindingsStore.export: no findings match the filter.")
+            return None
+        try:
+            if path.endswith(".xlsx"):
+                if pd is None:
+                    logging.warning("FindingsStore.export: pandas not available - install pandas & openpyxl for Excel output.")
+                    return None
+                pd.DataFrame(rows, columns=COLUMNS).to_excel(path, index=False, engine="openpyxl")
+            else:
+                import csv
+                with open(path, "w", encoding="utf-8", newline="") as fh:
+                    writer = csv.DictWriter(fh, fieldnames=COLUMNS)
+                    writer.writeheader()
+                    writer.writerows(rows)
+        except Exception as e:
+            logging.warning(f"FindingsStore.export: failed to write {path}: {e}", exc_info=True)
+            return None
+        logging.info(f"FindingsStore.export: wrote {len(rows)} findings -> {os.path.abspath(path)}")
+        return os.path.abspath(path)
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,123 @@
+# frontier.py
+import hashlib
+import math
+import queue
+import re
+import threading
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+# "scheme:" not followed by a port number
+_OTHER_SCHEME = re.compile(r"^[a-z][a-z0-9+.-]*:(?!\d)", re.IGNORECASE)
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalize a URL for crawling: lower-case scheme and host, drop default
+    ports, fragments and trailing slashes, sort query parameters.
+    Returns "" for anything that is not an http(s) URL.
+    """
+    url = (url or "").strip()
+    if not url:
+        return ""
+    if "://" not in url:
+        if _OTHER_SCHEME.match(url):
+            return ""  # mailto:, javascript:, tel:, ...
+        url = "http://" + url
+    try:
+        parts = urlsplit(url)
+        host = (parts.hostname or "").rstrip(".")
+        port = parts.port
+    except ValueError:
+        return ""
+    scheme = parts.scheme.lower()
+    if scheme not in _DEFAULT_PORTS or not host:
+        return ""
+    netloc = host if port in (None, _DEFAULT_PORTS[scheme]) else f"{host}:{port}"
+    path = parts.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/") or "/"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+
+def url_key(canonical_url: str) -> str:
+    """Dedup key for a canonical URL; http and https variants share a key."""
+    return canonical_url.split("://", 1)[-1]
+
+
+class BloomFilter:
+    """Fixed-memory probabilistic set (no false negatives) for very large seen-sets."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(1, int(capacity))
+        self.num_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._count = 0
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key: str):
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self._count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def __len__(self):
+        return self._count
+
+
+class Frontier(queue.Queue):
+    """
+    Crawl frontier: a FIFO queue of canonical URLs with constant-time dedup.
+
+    push(url) canonicalizes the URL and enqueues it only if it has not been
+    queued or scanned before. The seen-set is a plain set by default or a
+    BloomFilter for bounded memory. known(url) is an optional extra check
+    against persisted history (e.g. StateStore.is_scanned), and on_push(url) is
+    called for every URL actually enqueued (e.g. StateStore.enqueue).
+    """
+
+    def __init__(self, seen=None, known=None, on_push=None):
+        super().__init__()
+        self._seen = seen if seen is not None else set()
+        self._known = known
+        self._on_push = on_push
+        self._seen_lock = threading.Lock()
+
+    def push(self, url: str) -> bool:
+        """Queue url if it is new; returns True when it was queued."""
+        canon = canonicalize_url(url)
+        if not canon:
+            return False
+        key = url_key(canon)
+        with self._seen_lock:
+            if key in self._seen:
+                return False
+            self._seen.add(key)
+        if self._known is not None and self._known(canon):
+            return False
+        if self._on_push is not None:
+            self._on_push(canon)
+        self.put(canon)
+        return True
+
+    def mark_seen(self, url: str):
+        """Record url as seen without queueing it."""
+        canon = canonicalize_url(url)
+        if canon:
+            with self._seen_lock:
+                self._seen.add(url_key(canon))
+
+    def seen(self, url: str) -> bool:
+        canon = canonicalize_url(url)
+        with self._seen_lock:
+            return bool(canon) and url_key(canon) in self._seen
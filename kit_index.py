@@ -0,0 +1,101 @@
+# kit_index.py
+import hashlib
+import re
+import threading
+from collections import Counter
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+BITS = 64
+
+
+def tokens(text):
+    """Lower-cased word tokens; digits are masked so per-host ids/prices don't split a kit."""
+    return [re.sub(r"\d", "0", t) for t in _TOKEN.findall((text or "").lower())]
+
+
+def simhash(toks):
+    """64-bit SimHash of a token list, each token weighted by its count."""
+    weights = [0] * BITS
+    for tok, count in Counter(toks).items():
+        h = int.from_bytes(hashlib.blake2b(tok.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(BITS):
+            weights[bit] += count if (h >> bit) & 1 else -count
+    return sum(1 << bit for bit, w in enumerate(weights) if w > 0)
+
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+
+class Kit:
+    """A cluster of near-identical pages and the scores of its first fully evaluated member."""
+
+    __slots__ = ("cluster_id", "fingerprint", "similarity", "scam_score", "scam_match", "visual_score", "visual_match", "url", "members")
+
+    def __init__(self, cluster_id, fingerprint, similarity, visual_score, visual_match, url, scam_score=0.0, scam_match=None):
+        self.cluster_id = cluster_id
+        self.fingerprint = fingerprint
+        self.similarity = similarity
+        self.scam_score = scam_score
+        self.scam_match = scam_match
+        self.visual_score = visual_score
+        self.visual_match = visual_match
+        self.url = url
+        self.members = 1
+
+
+class KitIndex:
+    """
+    Near-duplicate page index: SimHash fingerprints with a banded LSH lookup.
+
+    The 64-bit fingerprint is split into max_distance + 1 bands; by pigeonhole any
+    fingerprint within max_distance bits of a stored one shares at least one band
+    exactly, so a lookup only compares against the few entries in matching buckets.
+    """
+
+    def __init__(self, max_distance=3, min_tokens=20):
+        self.max_distance = max_distance
+        self.min_tokens = min_tokens
+        self.bands = max_distance + 1
+        self._band_bits = -(-BITS // self.bands)
+        self._buckets = {}
+        self._kits = []
+        self._lock = threading.Lock()
+
+    def fingerprint(self, text):
+        """SimHash of normalized page text, or None when there is too little text to compare."""
+        toks = tokens(text)
+        if len(toks) < self.min_tokens:
+            return None
+        return simhash(toks)
+
+    def _band_keys(self, fp):
+        mask = (1 << self._band_bits) - 1
+        return [(i, (fp >> (i * self._band_bits)) & mask) for i in range(self.bands)]
+
+    def lookup(self, fp):
+        """The closest known Kit within max_distance bits of fp, or None."""
+        if fp is None:
+            return None
+        with self._lock:
+            best, best_d = None, self.max_distance + 1
+            for key in self._band_keys(fp):
+                for kit in self._buckets.get(key, ()):
+                    d = hamming(fp, kit.fingerprint)
+                    if d < best_d:
+                        best, best_d = kit, d
+            if best is not None:
+                best.members += 1
+            return best
+
+    def add(self, fp, similarity=0.0, visual_score=0.0, visual_match=None, url=None, scam_score=0.0, scam_match=None):
+        """Register a fully evaluated page as a new kit and return it."""
+        with self._lock:
+            kit = Kit(f"kit-{len(self._kits) + 1:04d}", fp, similarity, visual_score, visual_match, url, scam_score, scam_match)
+            self._kits.append(kit)
+            for key in self._band_keys(fp):
+                self._buckets.setdefault(key, []).append(kit)
+            return kit
+
+    def __len__(self):
+        return len(self._kits)
@@ -19,12 +19,12 @@ import os
 import json
 import logging
 import threading
+import uuid
 import queue as thread_queue
 import argparse  # <- ADD THIS MISSING IMPORT
 import time
 from urllib.parse import urlparse
-from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed  # <- ADD THIS
+from datetime import datetime, timedelta
 from dotenv import load_dotenv
 # Load environment variables from .env file (local dev only, do not commit .env)
 load_dotenv()
@@ -40,14 +40,28 @@ logging.basicConfig(
 )
 
 # --- Local module imports ---
-from fetcher import safe_get, extract_links, take_screenshot
+from fetcher import safe_get, extract_links, take_screenshot, configure_browser_pool, shutdown_browser_pool
+from fetcher import configure_fetcher, shutdown_fetcher, http_session, parse_page
 from enrich import whois_info, ssl_info
-from scorer import semantic_similarity
-from storage import append_findings
-from social import run_twitter_search
+from scorer import score_texts
+from findings_store import FindingsStore
+from social import TweetPoller
 from discovery import get_suspicious_domains
 from utils import is_typosquat
-from alerting import send_teams_alert
+from alerting import send_teams_alert, configure_alerts, shutdown_alerts
+from scoring_service import ScoringService
+from scheduler import CrawlScheduler
+from state_store import StateStore
+from frontier import Frontier, BloomFilter
+from enrich_cache import EnrichmentCache
+from confusables import SkeletonIndex
+from resolver import BulkResolver
+from visual_index import VisualIndex
+from cascade import RiskCascade
+from kit_index import KitIndex
+from scam_index import ScamIndex
+from feeds import stream_phishtank, PHISHTANK_URL
+from scorer import configure as configure_scorer, configure_cache as configure_embedding_cache, close_cache as close_embedding_cache
 
 # Load config with validation
 try:
@@ -68,22 +82,83 @@ if SEEDS is None:
 OFFICIAL_DOMAINS = set(config.get("official_domains", []))
 SUSPICIOUS_TLDS = set(config.get("suspicious_tlds", []))
 GOOGLE_API_KEY = config.get("google_safe_browsing_api_key", "")
+# skeleton -> official domain index for homoglyph / IDN lookalikes
+SKELETON_INDEX = SkeletonIndex(OFFICIAL_DOMAINS)
+SCORING_CONFIG = config.get("scoring") or {}
+SCREENSHOT_CONFIG = config.get("screenshots") or {}
+FETCH_CONFIG = config.get("fetch") or {}
+CRAWL_CONFIG = config.get("crawl") or {}
+FRONTIER_CONFIG = config.get("frontier") or {}
+ENRICH_CACHE_CONFIG = config.get("enrichment_cache") or {}
+DISCOVERY_CONFIG = config.get("discovery") or {}
+DNS_CONFIG = config.get("dns") or {}
+PHISHTANK_CONFIG = config.get("phishtank") or {}
+ALERT_CONFIG = config.get("alerts") or {}
+FINDINGS_CONFIG = config.get("findings") or {}
+VISUAL_CONFIG = config.get("visual") or {}
+CASCADE_CONFIG = config.get("cascade") or {}
+KIT_CONFIG = config.get("kits") or {}
+SCAM_INDEX_CONFIG = config.get("scam_index") or {}
+SOCIAL_CONFIG = config.get("social") or {}
+# SimHash index of fully scored pages, so copies of the same phishing kit inherit its scores
+KIT_INDEX = KitIndex(
+    max_distance=KIT_CONFIG.get("max_distance", 3),
+    min_tokens=KIT_CONFIG.get("min_tokens", 20),
+) if KIT_CONFIG.get("enabled", True) else None
+configure_scorer(model_name=SCORING_CONFIG.get("model"), backend=SCORING_CONFIG.get("backend"))
+
+STATE_DB = "scan_state.db"
+LEGACY_STATE_FILE = "scan_state.json"
+MAX_WORKERS = int(CRAWL_CONFIG.get("workers", 5))
+ENRICH_CACHE = None  # EnrichmentCache, opened by main()
+RESOLVER = None  # BulkResolver DNS pre-filter, built by main()
+VISUAL_INDEX = None  # VisualIndex over brand baseline screenshots, built by main()
+SCAM_INDEX = None  # ScamIndex of confirmed scam embeddings, loaded by main()
+ALERT_THRESHOLD = 0.7
+
+def ingest_phishtank(q: Frontier):
+    """Stream the PhishTank feed and push new brand-matching URLs into the live frontier."""
+    from urllib.parse import urlparse
+    keywords = {k.lower() for k in PHISHTANK_CONFIG.get("brand_keywords") or []}
+    keywords.update(d.split(".")[0].lower() for d in OFFICIAL_DOMAINS)
+    total = matched = 0
+
+    def push(url):
+        nonlocal matched
+        matched += 1
+        if q.push(url):
+            logging.info(f"Queueing PhishTank URL: {url}")
+
+    # rows that fail the cheap keyword/skeleton checks are typosquat-scored in chunks
+    pending = []
+    def flush():
+        hosts = [urlparse(url).hostname or "" for url in pending]
+        for url, (official, _) in zip(pending, best_typosquat_matches(hosts, OFFICIAL_DOMAINS)):
+            if official:
+                push(url)
+        pending.clear()
+
+    rows = stream_phishtank(
+        http_session(),
+        url=PHISHTANK_CONFIG.get("url", PHISHTANK_URL),
+        cache_path=PHISHTANK_CONFIG.get("cache_path", "phishtank_online-valid.csv"),
+    )
+    for row in rows:
+        total += 1
+        url = (row.get("url") or "").strip()
+        if not url:
+            continue
+        host = urlparse(url).hostname or ""
+        if any(k in url.lower() for k in keywords) or SKELETON_INDEX.lookup(host):
+            push(url)
+        else:
+            pending.append(url)
+            if len(pending) >= 1000:
+                flush()
+    if pending:
+        flush()
+    logging.info(f"PhishTank: {total} rows streamed, {matched} matched brand filters.")
 
-STATE_FILE = "scan_state.json"
-MAX_WORKERS = 5
-
-def fetch_phishtank_urls():
-    url = "https://data.phishtank.com/data/online-valid.csv"
-    response = safe_request(url)
-    if response is None:
-        logging.error(f"Failed to fetch PhishTank URLs after retries.")
-        return []
-    scam_urls = set()
-    lines = response.text.splitlines()
-    reader = csv.DictReader(lines)
-    for row in reader:
-        scam_urls.add(row['url'])
-    return list(scam_urls)
 # Advanced suspicious link filtering
 
 def is_suspicious(link):
@@ -99,13 +174,12 @@ def is_suspicious(link):
     return False
 
 # Replace local is_typosquat definition with import from utils
-from utils import is_typosquat
+from utils import is_typosquat, best_typosquat_matches
 # main.py
 from fetcher import safe_get, take_screenshot, extract_links
 from enrich import whois_info, ssl_info
-from social import run_twitter_search
-from scorer import semantic_similarity
-from storage import append_findings
+from social import TweetPoller
+from scorer import score_texts
 from alerting import send_teams_alert #unused check later
 import requests
 import csv
@@ -115,77 +189,197 @@ import logging
 import sys
 
 
-def scan_url(url: str, scanned: set, scanned_lock: threading.Lock, q: thread_queue.Queue) -> tuple:
-    """Scans a single URL, returns (record, new_links)."""
+def fetch_page(url: str, scanned: set, scanned_lock: threading.Lock, res: dict = None) -> dict:
+    """Fetches a single URL (unless `res` was prefetched) and parses it once. Returns a page dict or None."""
     logging.info(f"Processing: {url}")
     with scanned_lock:
         if url in scanned:
             logging.info(f"Already scanned: {url}")
-            return None, []
+            return None
         scanned.add(url)
-    res = safe_get(url)
+    if res is None:
+        res = safe_get(url)
     logging.info(f"Fetch result for {url}: {res}")
     if res.get("error"):
         logging.error(f"Fetch error for {url}: {res['error']}")
-        return None, []
-    title = ""
+        return None
+    # single parse: title, visible text and outbound links together
     try:
-        from bs4 import BeautifulSoup
-        soup = BeautifulSoup(res["text"], "html.parser")
-        title = soup.title.string if soup.title else ""
+        parsed = parse_page(res["text"], res.get("final_url") or url, parser=FETCH_CONFIG.get("parser"))
     except Exception:
-        logging.warning(f"Title extraction failed for {url}")
-        pass
-
-    # semantic check
-    sim = semantic_similarity((title + " " + res["text"])[:4000], BRAND_TEMPLATES)
-    # whois, ssl
+        logging.warning(f"HTML parse failed for {url}", exc_info=True)
+        parsed = {"title": "", "text": "", "links": []}
+    title = parsed["title"]
+    return {
+        "url": url,
+        "res": res,
+        "title": title,
+        "links": parsed["links"],
+        "score_text": (title + " " + parsed["text"])[:4000],
+    }
+
+def _enrich(kind, domain, fn):
+    """Run an enrichment lookup through the shared cache when one is open."""
+    if ENRICH_CACHE is None:
+        return fn(domain)
+    return ENRICH_CACHE.get(kind, domain, fn)
+
+def _weight(signal, default):
+    return float((CASCADE_CONFIG.get("weights") or {}).get(signal, default))
+
+# --- Risk cascade stages: each reads/extends the context and may raise ctx["risk"] ---
+
+def _url_stage(ctx):
+    """Cheap URL features: typosquat / homoglyph lookalike, suspicious TLD."""
+    domain = ctx["domain"]
+    if domain in OFFICIAL_DOMAINS:
+        signal = 0.0
+    elif best_typosquat_matches([domain], OFFICIAL_DOMAINS)[0][0] or SKELETON_INDEX.lookup(domain):
+        signal = 1.0
+    elif is_suspicious(ctx["url"]):
+        signal = 0.5
+    else:
+        signal = 0.0
+    ctx["url_score"] = signal
+    ctx["risk"] += signal * _weight("url", 0.2)
+
+def _text_stage(ctx):
+    kit = ctx.get("kit")
+    if kit is not None:
+        result = {"similarity": kit.similarity, "scam_score": kit.scam_score, "scam_id": kit.scam_match}
+    else:
+        result = ctx["score"](ctx["page"]["score_text"])
+    ctx["similarity"] = result["similarity"]
+    ctx["scam_score"], ctx["scam_match"] = result["scam_score"], result["scam_id"]
+    ctx["embedding"] = result.get("embedding")
+    # being close to a confirmed scam counts as much as being close to a brand template
+    ctx["risk"] += max(result["similarity"], result["scam_score"]) * _weight("text", 0.6)
+
+def _whois_stage(ctx):
+    ctx["whois"] = _enrich("whois", ctx["domain"], whois_info)
+
+def _ssl_stage(ctx):
+    ctx["ssl"] = _enrich("ssl", ctx["domain"], ssl_info)
+
+def _screenshot_stage(ctx):
+    kit = ctx.get("kit")
+    if kit is not None:
+        # a copy of a known kit renders like the kit; reuse its visual match
+        ctx["visual_score"], ctx["visual_match"] = kit.visual_score, kit.visual_match
+        ctx["risk"] += kit.visual_score * VISUAL_CONFIG.get("weight", 0.4)
+        return
+    screenshot = take_screenshot(ctx["url"])
+    ctx["screenshot"] = screenshot
+    # visual comparison against the precomputed brand baseline hashes
+    if VISUAL_INDEX is not None and screenshot:
+        ctx["visual_score"], ctx["visual_match"] = VISUAL_INDEX.match_file(screenshot)
+        ctx["risk"] += ctx["visual_score"] * VISUAL_CONFIG.get("weight", 0.4)
+
+CASCADE_STAGES = {
+    "url": _url_stage,
+    "text": _text_stage,
+    "whois": _whois_stage,
+    "ssl": _ssl_stage,
+    "screenshot": _screenshot_stage,
+}
+DEFAULT_CASCADE = [
+    {"name": "url"},
+    {"name": "text"},
+    {"name": "whois", "threshold": 0.1},
+    {"name": "ssl", "threshold": 0.1},
+    {"name": "screenshot", "threshold": 0.2},
+]
+RISK_CASCADE = RiskCascade.from_config(CASCADE_CONFIG.get("stages") or DEFAULT_CASCADE, CASCADE_STAGES)
+
+def _confirm_scam(finding_id, embedding):
+    """Index the embedding of a finding above the alert threshold as a known scam."""
+    if SCAM_INDEX is not None and embedding is not None:
+        SCAM_INDEX.add(finding_id, embedding)
+
+def analyze_page(page: dict, score, scanned: set, scanned_lock: threading.Lock, q: Frontier) -> tuple:
+    """Runs the risk cascade on a fetched page (`score` maps text to a scorer.score_texts result), returns (record, new_links)."""
+    url, title = page["url"], page["title"]
     domain = url.split("//")[-1].split("/")[0]
-    who = whois_info(domain)
-    sslc = ssl_info(domain)
-    screenshot = take_screenshot(url)
-
-    # visual comparison example (needs a baseline screenshot of brand)
-    # visual_score = visual_ssim(screenshot, "baseline_brand.png")
-    # combine to risk
-    risk_score = (sim * 0.6)  # add other signals
-
-    record = {"url": url, "domain": domain, "title": title, "similarity": sim, "whois": str(who), "ssl": str(sslc), "screenshot": screenshot, "risk": risk_score}
+    fingerprint = KIT_INDEX.fingerprint(page["score_text"]) if KIT_INDEX is not None else None
+    kit = KIT_INDEX.lookup(fingerprint) if fingerprint is not None else None
+    ctx = RISK_CASCADE.run({"url": url, "domain": domain, "page": page, "score": score, "kit": kit, "risk": 0.0})
+    risk_score = ctx["risk"]
+    if kit is None and fingerprint is not None and ctx["pruned_at"] is None:
+        # fully evaluated page: later near-duplicates inherit its scores
+        kit = KIT_INDEX.add(fingerprint, ctx.get("similarity", 0.0), ctx.get("visual_score", 0.0), ctx.get("visual_match"), url,
+                            scam_score=ctx.get("scam_score", 0.0), scam_match=ctx.get("scam_match"))
+
+    record = {"finding_id": uuid.uuid4().hex, "url": url, "domain": domain, "title": title,
+              "similarity": ctx.get("similarity", 0.0), "scam_score": ctx.get("scam_score", 0.0), "scam_match": ctx.get("scam_match"),
+              "url_score": ctx.get("url_score", 0.0),
+              "whois": ctx.get("whois"), "ssl": ctx.get("ssl"), "screenshot": ctx.get("screenshot", ""),
+              "visual_score": ctx.get("visual_score", 0.0), "visual_match": ctx.get("visual_match"),
+              "risk": risk_score, "pruned_at": ctx["pruned_at"], "cluster_id": kit.cluster_id if kit is not None else None}
     logging.info(f"Appended finding for {url}: {record}")
-    if risk_score > 0.7:
-        send_teams_alert(f"High risk detected: {url} (score {risk_score})")
+    if risk_score > ALERT_THRESHOLD:
+        send_teams_alert(f"High risk detected: {url} (score {risk_score})", key=domain)
+        _confirm_scam(record["finding_id"], ctx.get("embedding"))
 
     # Discover new links from the page
-    links = extract_links(res["text"], url)
+    links = page["links"]
     logging.info(f"Discovered {len(links)} links from {url}")
     new_links = []
-    for link in links:
-        from urllib.parse import urlparse
-        domain = urlparse(link).netloc
-        with scanned_lock:
-            # Check for suspicious TLD, brand keywords, or typosquatting
-            if (
-                (is_suspicious(link) or is_typosquat(domain, OFFICIAL_DOMAINS))
-                and link not in scanned
-            ):
-                logging.info(f"Queueing suspicious or typosquat link: {link}")
-                q.put(link)
-                new_links.append(link)
+    from urllib.parse import urlparse
+    # score all link hosts against all official domains in one vectorized call
+    matches = best_typosquat_matches([urlparse(link).netloc for link in links], OFFICIAL_DOMAINS)
+    candidates = []
+    for link, (official, _) in zip(links, matches):
+        # Check for suspicious TLD, brand keywords, typosquatting or homoglyph lookalikes
+        lookalike = official or SKELETON_INDEX.lookup(urlparse(link).hostname or "")
+        if (is_suspicious(link) or lookalike) and not q.seen(link):
+            candidates.append(link)
+    # drop links whose host has no DNS before they reach the fetch stage
+    if RESOLVER is not None and candidates:
+        alive = set(RESOLVER.filter_resolvable({urlparse(link).hostname or "" for link in candidates}))
+        candidates = [link for link in candidates if (urlparse(link).hostname or "") in alive]
+    for link in candidates:
+        # the frontier drops URLs already queued or scanned
+        if q.push(link):
+            logging.info(f"Queueing suspicious or typosquat link: {link}")
+            new_links.append(link)
     return record, new_links
 
-def scan_social(keywords):
+def scan_url(url: str, scanned: set, scanned_lock: threading.Lock, q: Frontier, scoring: ScoringService = None, res: dict = None) -> tuple:
+    """Scans a single URL, returns (record, new_links). Scores through `scoring` when given."""
+    page = fetch_page(url, scanned, scanned_lock, res)
+    if page is None:
+        return None, []
+    if scoring is not None:
+        score = scoring.score
+    else:
+        score = lambda text: score_texts([text], BRAND_TEMPLATES, scam_index=SCAM_INDEX)[0]
+    return analyze_page(page, score, scanned, scanned_lock, q)
+
+def scan_social(keywords, poller=None):
+    """Scores only the tweets posted since the previous run (per-keyword since_id cursors)."""
+    if poller is None:
+        poller = TweetPoller(
+            cursor_path=SOCIAL_CONFIG.get("cursor_path", "twitter_cursors.json"),
+            max_pages=SOCIAL_CONFIG.get("max_pages", 3),
+            page_size=SOCIAL_CONFIG.get("page_size", 100),
+            workers=SOCIAL_CONFIG.get("workers", 4),
+        )
     results = []
-    for kw in keywords:
+    for kw, tweets in poller.poll(keywords):
         try:
-            tweets = run_twitter_search(kw, limit=20)
-            logging.info(f"Twitter search returned {len(tweets)} tweets for '{kw}'")
-            for t in tweets:
-                txt = t.get("content") if isinstance(t, dict) else t.content
-                sim = semantic_similarity(txt, BRAND_TEMPLATES)
+            logging.info(f"Twitter search returned {len(tweets)} new tweets for '{kw}'")
+            texts = [t.get("content") if isinstance(t, dict) else t.content for t in tweets]
+            # score every tweet for this keyword in a single batched forward pass,
+            # against the brand templates and the known-scam index
+            for tweet, txt, res in zip(tweets, texts, score_texts(texts, BRAND_TEMPLATES, scam_index=SCAM_INDEX)):
+                sim = max(res["similarity"], res["scam_score"])
                 if sim > 0.75:
-                    results.append({"type": "tweet", "keyword": kw, "text": txt, "score": sim})
+                    finding_id = uuid.uuid4().hex
+                    results.append({"finding_id": finding_id, "type": "tweet", "keyword": kw, "text": txt, "score": sim,
+                                    "url": tweet.get("url") if isinstance(tweet, dict) else None, "scam_match": res["scam_id"]})
                     logging.warning(f"Potential scam tweet found: {txt[:200]}... (score {sim})")
-                    send_teams_alert(f"Potential scam tweet found: {txt[:200]}... (score {sim})")
+                    send_teams_alert(f"Potential scam tweet found: {txt[:200]}... (score {sim})", key=txt)
+                    _confirm_scam(finding_id, res["embedding"])
         except Exception as e:
             logging.error(f"Social scraping for '{kw}' skipped due to error: {e}", exc_info=True)
     return results
@@ -194,7 +388,7 @@ def safe_request(url, retries=3, delay=2):
     headers = {'User-Agent': 'Mozilla/5.0 (compatible; BrandMonitorBot/1.0)'}
     for attempt in range(retries):
         try:
-            response = requests.get(url, headers=headers, timeout=10)
+            response = http_session().get(url, headers=headers, timeout=10)
             response.raise_for_status()
             return response
         except Exception as e:
@@ -203,132 +397,226 @@ def safe_request(url, retries=3, delay=2):
     logging.error(f"All attempts failed for {url}")
     return None
 
-def load_state():
-    """Load intermediate scan state or return fresh state."""
-    if os.path.exists(STATE_FILE):
-        try:
-            with open(STATE_FILE, "r") as f:
-                state = json.load(f)
-            findings = state.get("findings", [])
-            scanned = set(state.get("scanned", []))
-            queue = state.get("queue", [])
-            if not queue:
-                queue = list(SEEDS) if SEEDS else []
-            logging.info(f"Resuming from saved state: {len(scanned)} scanned, {len(queue)} in queue.")
-        except Exception as e:
-            logging.error(f"Failed to load state: {e}", exc_info=True)
-            findings = []
-            scanned = set()
-            queue = list(SEEDS) if SEEDS else []
+def _frontier_seen_set():
+    """In-memory set by default; a Bloom filter when frontier.bloom_capacity is configured."""
+    capacity = FRONTIER_CONFIG.get("bloom_capacity")
+    if capacity:
+        return BloomFilter(capacity, FRONTIER_CONFIG.get("bloom_error_rate", 0.001))
+    return set()
+
+def _build_resolver():
+    """Bulk DNS pre-filter from config.yaml 'dns', or None when disabled/unavailable."""
+    if not DNS_CONFIG.get("enabled", True):
+        return None
+    try:
+        return BulkResolver(
+            concurrency=DNS_CONFIG.get("concurrency", 200),
+            timeout=DNS_CONFIG.get("timeout", 3.0),
+            nameservers=DNS_CONFIG.get("nameservers") or None,
+            negative_ttl=DNS_CONFIG.get("negative_ttl_seconds", 3600),
+        )
+    except Exception as e:
+        logging.warning(f"DNS pre-filter disabled: {e}")
+        return None
+
+def load_state(findings_store=None):
+    """Open the incremental scan state store and return (store, scanned, queue)."""
+    fresh = not os.path.exists(STATE_DB)
+    store = StateStore(STATE_DB)
+    if fresh and os.path.exists(LEGACY_STATE_FILE):
+        # one-off migration from the old full-snapshot JSON checkpoint
+        on_finding = findings_store.add if findings_store is not None else None
+        if store.import_json_state(LEGACY_STATE_FILE, on_finding=on_finding):
+            os.replace(LEGACY_STATE_FILE, LEGACY_STATE_FILE + ".migrated")
+            logging.info(f"Migrated {LEGACY_STATE_FILE} into {STATE_DB}.")
+    scanned = store.scanned_view()
+    queue = store.queued()
+    if queue:
+        logging.info(f"Resuming from saved state: {len(queue)} in queue.")
     else:
-        findings = []
-        scanned = set()
         queue = list(SEEDS) if SEEDS else []
-    return findings, scanned, queue
+    return store, scanned, queue
 
 def main():
     """Main pipeline orchestration."""
-    findings, scanned, queue_list = load_state()
+    global ENRICH_CACHE, RESOLVER, VISUAL_INDEX, SCAM_INDEX
+    # alerts are queued to a background dispatcher so a slow webhook never stalls workers
+    configure_alerts(
+        max_queue=ALERT_CONFIG.get("max_queue", 1000),
+        dedup_window=ALERT_CONFIG.get("dedup_window_seconds", 3600),
+        flush_interval=ALERT_CONFIG.get("flush_interval_seconds", 10),
+        min_interval=ALERT_CONFIG.get("min_interval_seconds", 2),
+        max_retries=ALERT_CONFIG.get("max_retries", 4),
+    )
+    RESOLVER = _build_resolver()
+    baseline_dir = VISUAL_CONFIG.get("baseline_dir", "baselines")
+    if VISUAL_CONFIG.get("enabled", True) and os.path.isdir(baseline_dir):
+        VISUAL_INDEX = VisualIndex.from_directory(baseline_dir, min_score=VISUAL_CONFIG.get("min_score", 0.25)) or None
+    ENRICH_CACHE = EnrichmentCache(
+        ENRICH_CACHE_CONFIG.get("path", "enrichment_cache.db"),
+        ttls=ENRICH_CACHE_CONFIG.get("ttl_seconds"),
+        negative_ttl=ENRICH_CACHE_CONFIG.get("negative_ttl_seconds", 900),
+    )
+    findings_store = FindingsStore(
+        FINDINGS_CONFIG.get("path", "findings.db"),
+        chunk_size=FINDINGS_CONFIG.get("chunk_size", 200),
+    )
+    store, scanned, queue_list = load_state(findings_store)
+    findings = []
     scanned_lock = threading.Lock()
-    q = thread_queue.Queue()
+    q = Frontier(seen=_frontier_seen_set(), known=store.is_scanned, on_push=store.enqueue)
     
     # Ensure queue_list is not None
     if queue_list is None:
         queue_list = []
     
     for url in queue_list:
-        q.put(url)
+        q.push(url)
 
     # Re-seed the queue if empty
     if q.qsize() == 0:
         logging.info("Queue is empty after loading state. Re-seeding with SEEDS.")
         for url in SEEDS:
-            if url not in scanned:
-                q.put(url)
-        suspicious_domains = get_suspicious_domains(OFFICIAL_DOMAINS, SUSPICIOUS_TLDS)
-        for d in suspicious_domains:
-            url = f"http://{d}"
-            if url not in scanned:
-                if is_typosquat(d, OFFICIAL_DOMAINS):
-                    logging.info(f"Suspicious typosquat domain detected during re-seed: {d}")
-                q.put(url)
+            q.push(url)
         logging.info(f"Queue re-seeded. {q.qsize()} URLs in queue.")
 
-    # Add suspicious domains to the queue
-    suspicious_domains = get_suspicious_domains(OFFICIAL_DOMAINS, SUSPICIOUS_TLDS)
-    for d in suspicious_domains:
-        url = f"http://{d}"
-        if url not in scanned and url not in list(q.queue):
-            if is_typosquat(d, OFFICIAL_DOMAINS):
+    # Suspicious domains stream into the frontier while the crawl is running
+    def push_candidate(d):
+        if q.push(f"http://{d}"):
+            if is_typosquat(d, OFFICIAL_DOMAINS) or SKELETON_INDEX.lookup(d):
                 logging.info(f"Suspicious typosquat domain detected: {d}")
-            q.put(url)
-
-    # Dynamic link discovery and scam detection (concurrent)
-    while not q.empty():
-        batch = []
-        for _ in range(min(MAX_WORKERS, q.qsize())):
-            try:
-                batch.append(q.get_nowait())
-            except thread_queue.Empty:
-                break
-        
-        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-            future_to_url = {executor.submit(scan_url, url, scanned, scanned_lock, q): url for url in batch}
-            for future in as_completed(future_to_url):
-                url = future_to_url[future]
-                try:
-                    record, _ = future.result()
-                    if record:
-                        findings.append(record)
-                except Exception as exc:
-                    logging.error(f"Error processing {url}: {exc}", exc_info=True)
-        
-        # Save intermediate state after each batch
-        with open(STATE_FILE, "w") as f:
-            json.dump({"findings": findings, "scanned": list(scanned), "queue": list(q.queue)}, f)
-        logging.info(f"Saved intermediate state: {len(scanned)} scanned, {q.qsize()} in queue.")
-
-    # Fetch scam URLs from PhishTank
-    try:
-        phishtank_urls = fetch_phishtank_urls()
-        logging.info(f"Fetched {len(phishtank_urls)} scam URLs from PhishTank.")
-        if phishtank_urls:
-            SEEDS.extend(phishtank_urls)
-    except Exception as e:
-        logging.error(f"Failed to fetch PhishTank URLs: {e}", exc_info=True)
+
+    def discover():
+        suspicious_domains = get_suspicious_domains(
+            OFFICIAL_DOMAINS, SUSPICIOUS_TLDS,
+            on_suspicious=push_candidate,
+            workers=DISCOVERY_CONFIG.get("workers", 8),
+            whois_rate_per_server=DISCOVERY_CONFIG.get("whois_rate_per_server", 1.0),
+            permutations=DISCOVERY_CONFIG.get("permutations", False),
+            resolver=RESOLVER,
+        )
+        logging.info(f"Discovery finished: {len(suspicious_domains)} suspicious domains.")
+
+    # Long-lived headless Chrome sessions shared by the scan workers
+    configure_browser_pool(
+        size=SCREENSHOT_CONFIG.get("pool_size", 2),
+        max_pages=SCREENSHOT_CONFIG.get("max_pages_per_browser", 50),
+    )
+
+    # Async fetch engine: keeps many requests in flight over pooled connections
+    fetch_engine = configure_fetcher(
+        concurrency=FETCH_CONFIG.get("concurrency", 200),
+        per_host=FETCH_CONFIG.get("per_host", 8),
+        timeout=FETCH_CONFIG.get("timeout", 10),
+    )
+
+    # Persistent embedding cache: text already encoded in this or earlier runs skips the model
+    embedding_cache = SCORING_CONFIG.get("embedding_cache") or {}
+    if embedding_cache.get("enabled", True):
+        configure_embedding_cache(embedding_cache.get("path", "embedding_cache"), capacity=embedding_cache.get("capacity", 100000))
+
+    # Embeddings of confirmed scams from earlier runs; new pages are matched against all of them
+    if SCAM_INDEX_CONFIG.get("enabled", True):
+        SCAM_INDEX = ScamIndex(SCAM_INDEX_CONFIG.get("path", "scam_index.npz"),
+                               model_id=SCORING_CONFIG.get("model") or "all-MiniLM-L6-v2")
+
+    # Shared micro-batching scorer: workers submit page text, the service batches across workers
+    scoring = ScoringService(
+        lambda texts: score_texts(texts, BRAND_TEMPLATES, scam_index=SCAM_INDEX),
+        max_batch_size=SCORING_CONFIG.get("max_batch_size", 32),
+        max_wait=SCORING_CONFIG.get("max_wait_ms", 20) / 1000.0,
+    ).start()
+
+    # Dynamic link discovery and scam detection: workers stay busy and pick up
+    # newly discovered links as soon as they are queued
+    # URL state is journaled as it happens and findings stream into the findings
+    # store in chunks; the periodic checkpoint only folds the WAL back into the database
+    def record_finding(record):
+        findings.append(record)
+        findings_store.add(record)
+
+    def checkpoint():
+        findings_store.flush()
+        store.checkpoint()
+        logging.info(f"Checkpointed scan state: {len(scanned)} scanned, {q.qsize()} in queue.")
+
+    scheduler = CrawlScheduler(
+        q,
+        lambda url, res: scan_url(url, scanned, scanned_lock, q, scoring, res)[0],
+        workers=MAX_WORKERS,
+        fetch=fetch_engine.submit if fetch_engine is not None else None,
+        max_in_flight=FETCH_CONFIG.get("concurrency", 200) if fetch_engine is not None else None,
+        on_result=record_finding,
+        checkpoint=checkpoint,
+        checkpoint_every=CRAWL_CONFIG.get("checkpoint_seconds", 30),
+    )
+    scheduler.add_source(discover, name="discovery")
+    if PHISHTANK_CONFIG.get("enabled", True):
+        scheduler.add_source(lambda: ingest_phishtank(q), name="phishtank")
+    scheduler.run()
+
+    scoring.close()
+    shutdown_browser_pool()
+    shutdown_fetcher()
+    logging.info(f"Enrichment cache stats: {ENRICH_CACHE.stats()}")
+    logging.info(f"Risk cascade stages (run / pruned): {RISK_CASCADE.stats()}")
+    if KIT_INDEX is not None:
+        logging.info(f"Kit index: {len(KIT_INDEX)} page clusters.")
+    if RESOLVER is not None:
+        logging.info(f"DNS pre-filter: {RESOLVER.nxdomain} NXDOMAIN domains dropped.")
+    ENRICH_CACHE.close()
+    ENRICH_CACHE = None
 
     # Social scanning
-    social_findings = scan_social(["BRAND_PLACEHOLDER", "m-pesa"])
-    if social_findings:
-        findings.extend(social_findings)
+    social_findings = scan_social(SOCIAL_CONFIG.get("keywords") or ["BRAND_PLACEHOLDER", "m-pesa"])
+    for record in social_findings:
+        record_finding(record)
 
     # Google Safe Browsing check
     if GOOGLE_API_KEY:
         for finding in findings:
-            if finding.get("url") and finding.get("risk", 0) > 0.7:
+            if finding.get("url") and finding.get("risk", 0) > ALERT_THRESHOLD:
                 url = finding["url"]
                 threats = check_google_safe_browsing(GOOGLE_API_KEY, url)
                 if threats:
                     logging.warning(f"High-risk URL detected by Google Safe Browsing: {url}")
-                    send_teams_alert(f"High-risk URL detected by Google Safe Browsing: {url}")
-
-    # Save findings to Excel and CSV
-    written_files = append_findings(findings)
-    if written_files:
-        logging.info(f"Saved findings files: {written_files}")
-    else:
-        logging.warning("No findings files were written.")
+                    send_teams_alert(f"High-risk URL detected by Google Safe Browsing: {url}", key=f"gsb:{url}")
+
+    close_embedding_cache()
+    if SCAM_INDEX is not None:
+        SCAM_INDEX.save()
+        logging.info(f"Known-scam index: {len(SCAM_INDEX)} confirmed scams.")
+    shutdown_alerts()
+
+    # Findings are already persisted; a spreadsheet of today's view is opt-in
+    findings_store.flush()
+    logging.info(f"Findings store {findings_store.path}: {findings_store.count()} findings in total.")
+    export = FINDINGS_CONFIG.get("export") or {}
+    if export.get("enabled", False):
+        now = datetime.utcnow()
+        since = now - timedelta(days=max(1, int(export.get("days", 1))) - 1)
+        written = findings_store.export(
+            export.get("path") or f"findings_{now.strftime('%Y%m%dT%H%M%SZ')}.xlsx",
+            since=since.strftime("%Y-%m-%d"),
+            min_risk=export.get("min_risk"),
+        )
+        if written:
+            logging.info(f"Exported findings view: {written}")
+    findings_store.close()
 
     # Save final state
-    with open(STATE_FILE, "w") as f:
-        json.dump({"findings": findings, "scanned": list(scanned), "queue": list(q.queue)}, f)
+    store.checkpoint()
     logging.info(f"Final state saved: {len(scanned)} scanned, {len(q.queue)} in queue.")
+    store.close()
 
 def clear_scan_state():
-    """Delete scan_state.json to force fresh run."""
-    if os.path.exists(STATE_FILE):
-        os.remove(STATE_FILE)
-        logging.info("Cleared scan state: scan_state.json deleted.")
+    """Delete the scan state database (and any legacy scan_state.json) to force fresh run."""
+    removed = StateStore.remove(STATE_DB)
+    if os.path.exists(LEGACY_STATE_FILE):
+        os.remove(LEGACY_STATE_FILE)
+        removed = True
+    if removed:
+        logging.info(f"Cleared scan state: {STATE_DB} deleted.")
     else:
         logging.info("No scan state file to clear.")
 
@@ -352,7 +640,7 @@ if __name__ == "__main__":
         clear_scan_state()
         logging.info("Scan state cleared (--reset). Starting fresh run.")
     else:
-        logging.info("Starting without clearing state. Use --reset to clear scan_state.json before run.")
+        logging.info(f"Starting without clearing state. Use --reset to clear {STATE_DB} before run.")
     
     TWITTER_BEARER_TOKEN = load_api_keys()
     main()
@@ -0,0 +1,155 @@
+# permutations.py
+import logging
+import typing
+
+from enrich_cache import registrable_domain
+
+# QWERTY neighbours used for insertion / replacement typos
+_KEYBOARD = {
+    "1": "2q", "2": "3wq1", "3": "4ew2", "4": "5re3", "5": "6tr4", "6": "7yt5", "7": "8uy6", "8": "9iu7", "9": "0oi8", "0": "po9",
+    "q": "12wa", "w": "3esaq2", "e": "4rdsw3", "r": "5tfde4", "t": "6ygfr5", "y": "7uhgt6", "u": "8ijhy7", "i": "9okju8", "o": "0plki9", "p": "lo0",
+    "a": "qwsz", "s": "edxzaw", "d": "rfcxse", "f": "tgvcdr", "g": "yhbvft", "h": "ujnbgy", "j": "ikmnhu", "k": "olmji", "l": "kop",
+    "z": "asx", "x": "zsdc", "c": "xdfv", "v": "cfgb", "b": "vghn", "n": "bhjm", "m": "njk",
+}
+
+# Latin letters and their look-alikes (ASCII and IDN)
+_HOMOGLYPHS = {
+    "a": ["à", "á", "â", "ã", "ä", "å", "ɑ", "а"], "b": ["d", "lb", "ʙ", "ь"], "c": ["e", "ϲ", "с"],
+    "d": ["b", "cl", "dl", "ԁ"], "e": ["é", "ê", "ë", "ē", "ė", "е"], "g": ["q", "ɡ"], "h": ["lh", "һ"],
+    "i": ["1", "l", "í", "ï", "ı", "і"], "j": ["ј"], "k": ["lk", "ik", "κ"], "l": ["1", "i", "ӏ", "ł"],
+    "m": ["n", "nn", "rn", "rr"], "n": ["m", "r", "ո"], "o": ["0", "ο", "о", "ö", "ó"], "p": ["ρ", "р"],
+    "q": ["g", "ԛ"], "r": ["г"], "s": ["ѕ"], "t": ["τ"], "u": ["μ", "υ", "ü"], "v": ["ν", "ѵ"],
+    "w": ["vv", "ԝ"], "x": ["х"], "y": ["у", "ý"], "z": ["ʐ"],
+}
+
+_LABEL_CHARS = set("abcdefghijklmnopqrstuvwxyz0123456789-")
+
+DEFAULT_TLDS = ("com", "net", "org", "info", "biz", "xyz", "top", "online", "site", "shop", "co", "io", "app")
+
+
+def _omission(name):
+    for i in range(len(name)):
+        yield name[:i] + name[i + 1:]
+
+
+def _transposition(name):
+    for i in range(len(name) - 1):
+        if name[i] != name[i + 1]:
+            yield name[:i] + name[i + 1] + name[i] + name[i + 2:]
+
+
+def _insertion(name):
+    for i, c in enumerate(name):
+        for k in _KEYBOARD.get(c, ""):
+            yield name[:i] + k + name[i:]
+            yield name[:i + 1] + k + name[i + 1:]
+
+
+def _replacement(name):
+    for i, c in enumerate(name):
+        for k in _KEYBOARD.get(c, ""):
+            yield name[:i] + k + name[i + 1:]
+
+
+def _repetition(name):
+    for i, c in enumerate(name):
+        yield name[:i] + c + name[i:]
+
+
+def _bitsquatting(name):
+    for i, c in enumerate(name):
+        for bit in range(8):
+            flipped = chr(ord(c) ^ (1 << bit))
+            if flipped in _LABEL_CHARS and flipped != "-":
+                yield name[:i] + flipped + name[i + 1:]
+
+
+def _homoglyph(name):
+    for i, c in enumerate(name):
+        for g in _HOMOGLYPHS.get(c, ()):
+            yield name[:i] + g + name[i + 1:]
+
+
+def _hyphenation(name):
+    for i in range(1, len(name)):
+        yield name[:i] + "-" + name[i:]
+
+
+def _subdomain(name):
+    # "exa.mple" -> the suffix becomes the registered domain under "exa."
+    for i in range(1, len(name)):
+        if name[i - 1] not in "-." and name[i] not in "-.":
+            yield name[:i] + "." + name[i:]
+
+
+# fuzzers applied to the brand label; tld-swap is handled separately
+FUZZERS = {
+    "omission": _omission,
+    "transposition": _transposition,
+    "insertion": _insertion,
+    "replacement": _replacement,
+    "repetition": _repetition,
+    "bitsquatting": _bitsquatting,
+    "homoglyph": _homoglyph,
+    "hyphenation": _hyphenation,
+    "subdomain": _subdomain,
+}
+
+
+def _to_ascii(domain: str) -> str:
+    """IDNA-encode a candidate; returns "" if it is not a valid hostname."""
+    try:
+        ascii_domain = domain.encode("idna").decode("ascii")
+    except Exception:
+        return ""
+    for label in ascii_domain.split("."):
+        if not label or len(label) > 63 or label[0] == "-" or label[-1] == "-" or not set(label) <= _LABEL_CHARS:
+            return ""
+    return ascii_domain
+
+
+def iter_permutations(official_domains: typing.Iterable[str], tlds: typing.Iterable[str] = DEFAULT_TLDS,
+                      fuzzers: typing.Iterable[str] = None) -> typing.Iterator[str]:
+    """
+    Lazily yield lookalike domains for every official domain.
+
+    Each brand label is run through the selected fuzzers (default: all of
+    FUZZERS plus "tld-swap"), kept on its original suffix, and for tld-swap
+    also placed under every TLD in `tlds`. Candidates are IDNA-encoded,
+    validated and deduplicated across all official domains; the official
+    domains themselves are never yielded.
+    """
+    official = [d.strip().lower().rstrip(".") for d in official_domains or [] if d]
+    selected = list(fuzzers) if fuzzers is not None else list(FUZZERS) + ["tld-swap"]
+    unknown = [f for f in selected if f not in FUZZERS and f != "tld-swap"]
+    if unknown:
+        logging.warning(f"Unknown permutation fuzzers ignored: {unknown}")
+    tlds = [t.lstrip(".").lower() for t in tlds or []]
+    seen = set(official)
+
+    def emit(candidate):
+        candidate = _to_ascii(candidate)
+        if candidate and candidate not in seen:
+            seen.add(candidate)
+            return candidate
+        return None
+
+    for domain in official:
+        reg = registrable_domain(domain)
+        name, _, suffix = reg.partition(".")
+        if not name or not suffix:
+            continue
+        for fuzzer in selected:
+            if fuzzer == "tld-swap":
+                for tld in tlds:
+                    c = emit(f"{name}.{tld}")
+                    if c:
+                        yield c
+                continue
+            fn = FUZZERS.get(fuzzer)
+            if fn is None:
+                continue
+            for variant in fn(name):
+                c = emit(f"{variant}.{suffix}")
+                if c:
+                    yield c
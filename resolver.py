@@ -0,0 +1,117 @@
+# resolver.py
+import asyncio
+import logging
+import threading
+import time
+
+try:
+    import dns.asyncresolver
+    import dns.exception
+    import dns.resolver
+except Exception:
+    dns = None
+    logging.warning("dnspython not available - BulkResolver needs a stub query function. Install dnspython for the DNS pre-filter.")
+
+RECORD_TYPES = ("A", "AAAA", "MX", "NS")
+
+
+class NXDomain(Exception):
+    """Raised by a query function when the domain does not exist."""
+
+
+class BulkResolver:
+    """
+    Bulk asynchronous DNS pre-filter.
+
+    resolve_many() looks up A/AAAA/MX/NS records for many domains at once,
+    with at most `concurrency` queries in flight and `timeout` seconds per
+    query. Record types are tried in order and a domain stops at the first
+    one that answers. NXDOMAIN answers are cached for negative_ttl seconds. Timeouts and
+    other errors count as "unknown" and are never used to drop a domain.
+
+    query(domain, rdtype) -> list[str] is an async callable that raises
+    NXDomain; it defaults to dnspython and can be replaced by a local stub.
+    """
+
+    def __init__(self, concurrency=200, timeout=3.0, rdtypes=RECORD_TYPES, nameservers=None,
+                 negative_ttl=3600, query=None):
+        self.concurrency = max(1, int(concurrency))
+        self.timeout = timeout
+        self.rdtypes = tuple(rdtypes)
+        self.negative_ttl = negative_ttl
+        self._negative = {}
+        self._lock = threading.Lock()
+        self.nxdomain = 0
+        if query is None:
+            if dns is None:
+                raise RuntimeError("BulkResolver requires dnspython or a query function")
+            self._resolver = dns.asyncresolver.Resolver()
+            if nameservers:
+                self._resolver.nameservers = list(nameservers)
+            self._resolver.lifetime = timeout
+            query = self._dns_query
+        self._query = query
+
+    async def _dns_query(self, domain, rdtype):
+        try:
+            answer = await self._resolver.resolve(domain, rdtype)
+        except dns.resolver.NXDOMAIN:
+            raise NXDomain(domain)
+        except (dns.resolver.NoAnswer, dns.resolver.NoNameservers):
+            return []
+        return [r.to_text() for r in answer]
+
+    def _cached_nx(self, domain):
+        with self._lock:
+            expiry = self._negative.get(domain)
+            if expiry is None:
+                return False
+            if expiry > time.monotonic():
+                return True
+            del self._negative[domain]
+            return False
+
+    async def _resolve_one(self, domain, sem):
+        records = {}
+        async with sem:
+            for rdtype in self.rdtypes:
+                try:
+                    records[rdtype] = await asyncio.wait_for(self._query(domain, rdtype), self.timeout)
+                except NXDomain:
+                    with self._lock:
+                        self._negative[domain] = time.monotonic() + self.negative_ttl
+                        self.nxdomain += 1
+                    return domain, None
+                except Exception as e:
+                    logging.debug(f"DNS {rdtype} lookup for {domain} inconclusive: {e!r}")
+                    records[rdtype] = []
+                if records[rdtype]:
+                    # one positive answer proves the domain exists; skip the other rdtypes
+                    break
+        return domain, records
+
+    async def resolve_many_async(self, domains) -> dict:
+        sem = asyncio.Semaphore(self.concurrency)
+        results = {}
+        todo = []
+        for d in dict.fromkeys(domains):
+            if self._cached_nx(d):
+                results[d] = None
+            else:
+                todo.append(self._resolve_one(d, sem))
+        for domain, records in await asyncio.gather(*todo):
+            results[domain] = records
+        return results
+
+    def resolve_many(self, domains) -> dict:
+        """Map each domain to {rdtype: [records]} (up to the first answered rdtype) or None for NXDOMAIN."""
+        domains = list(domains)
+        if not domains:
+            return {}
+        return asyncio.run(self.resolve_many_async(domains))
+
+    def filter_resolvable(self, domains) -> list:
+        """Drop NXDOMAIN domains, keeping input order."""
+        domains = list(domains)
+        results = self.resolve_many(domains)
+        return [d for d in domains if results.get(d) is not None]
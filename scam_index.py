@@ -0,0 +1,99 @@
+# scam_index.py
+import logging
+import os
+import threading
+
+import numpy as np
+
+
+class ScamIndex:
+    """
+    Exact nearest-neighbour index over embeddings of confirmed scam pages/tweets.
+
+    Vectors are L2-normalized, so one (n_queries, dim) @ (dim, n_known) product
+    gives every cosine similarity; np.argpartition then picks the top k per
+    query without a full sort. Exact search stays fast well into the tens of
+    thousands of known scams on a CPU. Rows are kept in a capacity-doubling
+    buffer and the index is persisted to a single .npz file (vectors, ids and
+    the encoder model id); a file built with another model is not loaded.
+    """
+
+    def __init__(self, path=None, model_id=None):
+        self.path = path
+        self.model_id = model_id
+        self._lock = threading.Lock()
+        self._ids = []
+        self._known = set()
+        self._matrix = None
+        if path and os.path.exists(path):
+            try:
+                with np.load(path, allow_pickle=False) as data:
+                    vectors, ids = data["vectors"].astype(np.float32), [str(i) for i in data["ids"]]
+                    stored_model = str(data["model"]) if "model" in data.files else None
+            except Exception as e:
+                logging.warning(f"ScamIndex: could not load {path}: {e}")
+                return
+            if model_id is not None and stored_model != model_id:
+                # embeddings from another encoder live in a different vector space (and often dimension)
+                logging.warning(f"ScamIndex: {path} was built with model {stored_model!r}, not {model_id!r}; starting a new index.")
+                return
+            self._matrix = vectors
+            self._ids = ids
+            self._known = set(ids)
+            logging.info(f"ScamIndex: loaded {len(ids)} known scams from {path}")
+
+    def __len__(self):
+        return len(self._ids)
+
+    def add(self, finding_id, vector):
+        """Add the embedding of a confirmed scam; returns False if finding_id is already indexed."""
+        v = np.asarray(vector, dtype=np.float32).ravel()
+        v = v / (np.linalg.norm(v) + 1e-9)
+        with self._lock:
+            if finding_id in self._known:
+                return False
+            n = len(self._ids)
+            if self._matrix is not None and self._matrix.shape[1] != v.shape[0]:
+                logging.warning(f"ScamIndex: embedding dimension {v.shape[0]} != index dimension {self._matrix.shape[1]}; not indexed.")
+                return False
+            if self._matrix is None:
+                self._matrix = np.zeros((16, v.shape[0]), dtype=np.float32)
+            elif n == self._matrix.shape[0]:
+                self._matrix = np.vstack([self._matrix, np.zeros_like(self._matrix)])
+            self._matrix[n] = v
+            self._ids.append(finding_id)
+            self._known.add(finding_id)
+            return True
+
+    def search(self, queries, k=1):
+        """
+        Top-k known scams for each row of queries (n, dim).
+        Returns (scores, ids): an (n, k') cosine array and n lists of finding ids,
+        best first, with k' = min(k, len(index)).
+        """
+        q = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        with self._lock:
+            n = len(self._ids)
+            if n == 0 or len(q) == 0 or q.shape[1] != self._matrix.shape[1]:
+                return np.zeros((len(q), 0), dtype=np.float32), [[] for _ in range(len(q))]
+            sims = q @ self._matrix[:n].T
+            ids = self._ids[:n]
+        k = min(k, n)
+        top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(sims, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        return np.take_along_axis(top_scores, order, axis=1), [[ids[j] for j in row] for row in top]
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            n = len(self._ids)
+            if n == 0:
+                return
+            vectors, ids = self._matrix[:n].copy(), np.array(self._ids)
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as fh:
+            np.savez(fh, vectors=vectors, ids=ids, model=np.array(self.model_id or ""))
+        os.replace(tmp, self.path)
@@ -0,0 +1,137 @@
+# scheduler.py
+import logging
+import queue
+import threading
+import time
+
+_STOP = object()
+
+
+class CrawlScheduler:
+    """
+    Continuous crawl scheduler with no batch barriers.
+
+    A dispatcher thread takes URLs from the frontier (a queue.Queue) as soon as
+    they arrive and starts their fetch; a fixed set of worker threads runs
+    process(url, res) on each page as its fetch completes. Links a worker pushes
+    back into the frontier are picked up by the next idle worker, so one slow
+    page never holds the others up. run() returns once every source added
+    with add_source() has finished, the frontier is empty and nothing is in
+    flight.
+
+    fetch(url) -> concurrent.futures.Future is optional; without it workers
+    receive res=None and fetch inside process(). max_in_flight bounds how many
+    URLs are dispatched but not yet processed.
+    """
+
+    def __init__(self, frontier, process, workers=5, fetch=None, max_in_flight=None,
+                 on_result=None, checkpoint=None, checkpoint_every=30.0):
+        self.frontier = frontier
+        self.process = process
+        self.workers = max(1, int(workers))
+        self.fetch = fetch
+        if max_in_flight is None:
+            max_in_flight = self.workers * 2
+        self._slots = threading.Semaphore(max(self.workers, int(max_in_flight)))
+        self.on_result = on_result
+        self.checkpoint = checkpoint
+        self.checkpoint_every = checkpoint_every
+        self._ready = queue.Queue()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._in_flight = set()
+        self._last_checkpoint = time.monotonic()
+        self.processed = 0
+        self._sources = []
+
+    def add_source(self, fn, name="crawl-source"):
+        """
+        Run fn() on its own thread during run(); fn typically streams URLs into
+        the frontier (discovery, feeds). run() does not finish before it returns.
+        """
+        self._sources.append(threading.Thread(target=self._run_source, args=(fn,), name=name, daemon=True))
+
+    def _run_source(self, fn):
+        try:
+            fn()
+        except Exception as exc:
+            logging.error(f"CrawlScheduler: source {threading.current_thread().name} failed: {exc}", exc_info=True)
+
+    def in_flight(self) -> list:
+        """URLs taken from the frontier but not finished yet (for checkpoints)."""
+        with self._lock:
+            return list(self._in_flight)
+
+    def run(self):
+        threads = [threading.Thread(target=self._dispatch, name="crawl-dispatch", daemon=True)]
+        threads += [threading.Thread(target=self._work, name=f"crawl-worker-{i}", daemon=True) for i in range(self.workers)]
+        for t in threads + self._sources:
+            t.start()
+        try:
+            # sources may keep adding URLs after the frontier momentarily drains
+            for t in self._sources:
+                t.join()
+            self.frontier.join()
+        finally:
+            self._stop.set()
+            threads[0].join()
+            for _ in range(self.workers):
+                self._ready.put(_STOP)
+            for t in threads[1:]:
+                t.join()
+        self._checkpoint(force=True)
+        logging.info(f"CrawlScheduler: processed {self.processed} URLs with {self.workers} workers.")
+
+    def _dispatch(self):
+        while not self._stop.is_set():
+            if not self._slots.acquire(timeout=0.2):
+                continue
+            try:
+                url = self.frontier.get(timeout=0.2)
+            except queue.Empty:
+                self._slots.release()
+                continue
+            with self._lock:
+                self._in_flight.add(url)
+            if self.fetch is None:
+                self._ready.put((url, None))
+                continue
+            try:
+                fut = self.fetch(url)
+                fut.add_done_callback(lambda f, url=url: self._ready.put((url, f)))
+            except Exception as e:
+                logging.error(f"CrawlScheduler: fetch dispatch failed for {url}: {e}", exc_info=True)
+                self._ready.put((url, None))
+
+    def _work(self):
+        while True:
+            item = self._ready.get()
+            if item is _STOP:
+                break
+            url, fut = item
+            try:
+                res = fut.result() if fut is not None else None
+                record = self.process(url, res)
+                if record and self.on_result:
+                    self.on_result(record)
+            except Exception as exc:
+                logging.error(f"Error processing {url}: {exc}", exc_info=True)
+            finally:
+                with self._lock:
+                    self._in_flight.discard(url)
+                    self.processed += 1
+                self._slots.release()
+                self._checkpoint()
+                self.frontier.task_done()
+
+    def _checkpoint(self, force=False):
+        if self.checkpoint is None:
+            return
+        with self._lock:
+            if not force and time.monotonic() - self._last_checkpoint < self.checkpoint_every:
+                return
+            self._last_checkpoint = time.monotonic()
+        try:
+            self.checkpoint()
+        except Exception as e:
+            logging.error(f"CrawlScheduler: checkpoint failed: {e}", exc_info=True)
@@ -1,23 +1,193 @@
 # scorer.py
-from sentence_transformers import SentenceTransformer, util
-import cv2
+import logging
+import threading
+
 import numpy as np
 
-MODEL = SentenceTransformer("all-MiniLM-L6-v2")
+from embedding_cache import EmbeddingCache, cache_key
 
+# The encoder is loaded lazily on the first scoring call so that --reset,
+# discovery-only runs and the tests do not pay for it. configure() picks the
+# model and CPU backend from config.yaml before that first call.
+MODEL_NAME = "all-MiniLM-L6-v2"
+BACKEND = "torch"
+BACKENDS = ("torch", "int8", "onnx", "onnx-int8")
+_model = None
+_model_lock = threading.Lock()
+
+# Template embeddings are built once per template set and reused for every
+# page/tweet. The cache key includes the tuple of templates, so a change to
+# config.yaml's brand_templates produces a new key and a fresh matrix.
+_template_lock = threading.Lock()
+_template_key = None
+_template_matrix = None
+
+# Optional persistent embedding cache (see configure_cache); hits skip the encoder.
+_embedding_cache = None
+
+
+def configure(model_name=None, backend=None):
+    """Select the encoder model and backend (torch, int8, onnx, onnx-int8). Takes effect on the next load."""
+    global MODEL_NAME, BACKEND, _model
+    if backend and backend not in BACKENDS:
+        logging.warning(f"Unknown scorer backend '{backend}', using 'torch'. Choose from {BACKENDS}.")
+        backend = "torch"
+    with _model_lock:
+        new_name = model_name or MODEL_NAME
+        new_backend = backend or BACKEND
+        if (new_name, new_backend) != (MODEL_NAME, BACKEND):
+            MODEL_NAME, BACKEND = new_name, new_backend
+            _model = None
+
+
+def _load_model(model_name, backend):
+    from sentence_transformers import SentenceTransformer
+    if backend == "onnx":
+        return SentenceTransformer(model_name, device="cpu", backend="onnx")
+    if backend == "onnx-int8":
+        # pre-quantized ONNX export shipped with the sentence-transformers hub models
+        return SentenceTransformer(model_name, device="cpu", backend="onnx",
+                                   model_kwargs={"file_name": "onnx/model_qint8_avx2.onnx"})
+    if backend == "int8":
+        import torch
+        model = SentenceTransformer(model_name, device="cpu")
+        return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return SentenceTransformer(model_name)
+
+
+def get_model():
+    """Return the shared encoder, loading it on first use."""
+    global _model, BACKEND
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                try:
+                    _model = _load_model(MODEL_NAME, BACKEND)
+                except Exception as e:
+                    if BACKEND == "torch":
+                        raise
+                    logging.warning(f"Failed to load '{BACKEND}' backend ({e}); falling back to torch.", exc_info=True)
+                    _model = _load_model(MODEL_NAME, "torch")
+                    # BACKEND names the encoder actually in use (cache keys, logs, benchmarks)
+                    BACKEND = "torch"
+                logging.info(f"Loaded encoder {MODEL_NAME} ({BACKEND} backend).")
+    return _model
+
+
+def template_matrix(brand_templates):
+    """Return the L2-normalized (n_templates, dim) embedding matrix for brand_templates."""
+    global _template_key, _template_matrix
+    with _template_lock:
+        if (MODEL_NAME, BACKEND, tuple(brand_templates)) != _template_key or _template_matrix is None:
+            _template_matrix = get_model().encode(list(brand_templates), convert_to_numpy=True, normalize_embeddings=True).astype(np.float32)
+            # keyed after loading, so a backend fallback is reflected in the key
+            _template_key = (MODEL_NAME, BACKEND, tuple(brand_templates))
+        return _template_matrix
+
+
+def invalidate_template_cache():
+    """Drop the cached template matrix (e.g. after reloading config.yaml)."""
+    global _template_key, _template_matrix
+    with _template_lock:
+        _template_key = None
+        _template_matrix = None
 
-def semantic_similarity(text, brand_templates, threshold=0.65):
-    emb_text = MODEL.encode(text, convert_to_tensor=True)
-    emb_templates = MODEL.encode(brand_templates, convert_to_tensor=True)
-    sims = util.cos_sim(emb_text, emb_templates).cpu().numpy()
-    max_sim = sims.max()
 
-    if max_sim >= threshold:
-        return float(max_sim)
+def configure_cache(path="embedding_cache", capacity=100000):
+    """Open the persistent embedding cache used by embed_texts (None path disables it)."""
+    global _embedding_cache
+    close_cache()
+    if path:
+        _embedding_cache = EmbeddingCache(path, capacity=capacity)
+    return _embedding_cache
+
+
+def close_cache():
+    global _embedding_cache
+    if _embedding_cache is not None:
+        logging.info(f"Embedding cache stats: {_embedding_cache.stats()}")
+        _embedding_cache.close()
+        _embedding_cache = None
+
+
+def _encode(texts, batch_size):
+    return get_model().encode(list(texts), batch_size=batch_size, convert_to_numpy=True, normalize_embeddings=True).astype(np.float32)
+
+
+def embed_texts(texts, batch_size=32):
+    """
+    Encode texts in padded batches; returns an L2-normalized (n, dim) float32 matrix.
+    Repeated texts are encoded once, and texts found in the embedding cache not at all.
+    """
+    texts = list(texts)
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32)
+    if _model is None and BACKEND != "torch":
+        # load first: a failed int8/onnx load falls back to torch, and the cache must be keyed by the encoder in use
+        get_model()
+    model_id = f"{MODEL_NAME}:{BACKEND}"
+    keys = [cache_key(model_id, t) for t in texts]
+    cache = _embedding_cache
+    known = cache.get_many(keys) if cache is not None else {}
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key not in known and key not in missing:
+            missing[key] = text
+    if missing:
+        fresh = _encode(missing.values(), batch_size)
+        if cache is not None:
+            cache.put_many(list(missing), fresh)
+        known.update(zip(missing, fresh))
+    return np.stack([known[k] for k in keys])
+
+
+def semantic_similarity_batch(texts, brand_templates, threshold=0.65, batch_size=32):
+    """
+    Score N texts against brand_templates in one batched forward pass.
+    Returns a list of N floats with the same thresholding as semantic_similarity.
+    """
+    texts = list(texts)
+    if not texts:
+        return []
+    templates = template_matrix(brand_templates)
+    # both sides are unit vectors, so the dot product is the cosine similarity
+    sims = (embed_texts(texts, batch_size=batch_size) @ templates.T).max(axis=1)
+    return [float(s) if s >= threshold else 0.0 for s in sims]
+
+
+def score_texts(texts, brand_templates, scam_index=None, threshold=0.65, batch_size=32):
+    """
+    Embed texts once and score them against brand_templates and, when given, a
+    ScamIndex of confirmed scams. Returns one dict per text: similarity and
+    scam_score (both zeroed below threshold), scam_id of the nearest known scam
+    and the embedding itself (for adding confirmed scams to the index).
+    """
+    texts = list(texts)
+    if not texts:
+        return []
+    vecs = embed_texts(texts, batch_size=batch_size)
+    sims = (vecs @ template_matrix(brand_templates).T).max(axis=1)
+    if scam_index is not None and len(scam_index):
+        scam_scores, scam_ids = scam_index.search(vecs, k=1)
     else:
-        return 0.0  # or None, or raise a warning
+        scam_scores, scam_ids = np.zeros((len(texts), 0)), [[] for _ in texts]
+    results = []
+    for vec, sim, scam_score, scam_id in zip(vecs, sims, scam_scores, scam_ids):
+        nearest = float(scam_score[0]) if len(scam_score) else 0.0
+        results.append({
+            "similarity": float(sim) if sim >= threshold else 0.0,
+            "scam_score": nearest if nearest >= threshold else 0.0,
+            "scam_id": scam_id[0] if scam_id and nearest >= threshold else None,
+            "embedding": vec,
+        })
+    return results
+
+
+def semantic_similarity(text, brand_templates, threshold=0.65):
+    return semantic_similarity_batch([text], brand_templates, threshold=threshold)[0]
 
 def visual_ssim(img_path1, img_path2):
+    import cv2
     # read grayscale
     a = cv2.imread(img_path1, cv2.IMREAD_GRAYSCALE)
     b = cv2.imread(img_path2, cv2.IMREAD_GRAYSCALE)
@@ -28,4 +198,3 @@ def visual_ssim(img_path1, img_path2):
     b = b.astype(np.float32)
     norm = np.sum((a - a.mean())*(b - b.mean())) / (np.sqrt(np.sum((a-a.mean())**2)*np.sum((b-b.mean())**2))+1e-9)
     return float(norm)
-
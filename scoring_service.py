@@ -0,0 +1,100 @@
+# scoring_service.py
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+_STOP = object()
+
+
+class ScoringService:
+    """
+    Dedicated scoring thread shared by crawler workers.
+
+    Workers call submit(text) and get a Future back. The service thread groups
+    pending texts into micro-batches of at most max_batch_size, waiting at most
+    max_wait seconds after the first text of a batch, and scores each batch with
+    a single score_fn(texts) -> list call. Fetch concurrency (worker count) and
+    model throughput (batch size / wait) can therefore be tuned independently.
+    """
+
+    def __init__(self, score_fn, max_batch_size=32, max_wait=0.02, max_queue=1024):
+        self.score_fn = score_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait))
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self.batches = 0
+        self.scored = 0
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="scoring-service", daemon=True)
+            self._thread.start()
+        return self
+
+    def submit(self, text) -> Future:
+        """Queue text for scoring; blocks only if the service queue is full."""
+        if self._thread is None:
+            raise RuntimeError("ScoringService is not running")
+        fut = Future()
+        self._queue.put((text, fut))
+        return fut
+
+    def score(self, text, timeout=None) -> float:
+        return self.submit(text).result(timeout=timeout)
+
+    def close(self):
+        """Flush pending texts and stop the service thread."""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+        if self.batches:
+            logging.info(f"ScoringService: scored {self.scored} texts in {self.batches} batches "
+                         f"(avg batch {self.scored / self.batches:.1f}).")
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._score_batch(batch)
+
+    def _score_batch(self, batch):
+        # skip futures the caller already cancelled
+        batch = [(text, fut) for text, fut in batch if fut.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        try:
+            scores = self.score_fn([text for text, _ in batch])
+        except Exception as e:
+            logging.error(f"ScoringService: batch of {len(batch)} failed: {e}", exc_info=True)
+            for _, fut in batch:
+                fut.set_exception(e)
+            return
+        self.batches += 1
+        self.scored += len(batch)
+        for (_, fut), score in zip(batch, scores):
+            fut.set_result(score)
@@ -1,48 +1,183 @@
 # social.py
-import tweepy
+import json
+import logging
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+try:
+    import tweepy
+except Exception:
+    tweepy = None
+    logging.warning("tweepy not available - Twitter scanning disabled.")
 
 
 # Load Twitter API credentials from environment variables
-BEARER_TOKEN = os.getenv("token")
+BEARER_TOKEN = os.getenv("TWITTER_BEARER_TOKEN") or os.getenv("token")
 API_KEY = os.getenv("key")
 API_SECRET = os.getenv("secret")
 ACCESS_TOKEN = os.getenv("token")
 ACCESS_TOKEN_SECRET = os.getenv("token")
 
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Shared tweepy.Client (created once). Rate limits are handled by the caller, never by sleeping."""
+    global _client
+    if tweepy is None or not BEARER_TOKEN:
+        return None
+    with _client_lock:
+        if _client is None:
+            _client = tweepy.Client(bearer_token=BEARER_TOKEN, wait_on_rate_limit=False)
+        return _client
+
+
+def _tweet_dict(tweet):
+    return {
+        "id": str(tweet.id),
+        "user": tweet.author_id,
+        "content": tweet.text,
+        "url": f"https://twitter.com/i/web/status/{tweet.id}",
+        "date": tweet.created_at,
+    }
+
+
 def run_twitter_search(keyword, limit=20):
-    import time
-    if not BEARER_TOKEN:
-        print("Twitter API bearer token not set. Set TWITTER_BEARER_TOKEN in your environment.")
+    """One page of recent tweets for keyword. Returns [] when rate limited or on error."""
+    client = get_client()
+    if client is None:
+        logging.warning("Twitter API bearer token not set. Set TWITTER_BEARER_TOKEN in your environment.")
         return []
-    client = tweepy.Client(bearer_token=BEARER_TOKEN, wait_on_rate_limit=True)
     try:
-        tweets = client.search_recent_tweets(query=keyword, max_results=limit, tweet_fields=["author_id", "created_at"])
-        # Rate limit handling
-        if hasattr(tweets, 'meta') and 'x-rate-limit-remaining' in tweets.meta:
-            remaining = int(tweets.meta['x-rate-limit-remaining'])
-            reset = int(tweets.meta.get('x-rate-limit-reset', 0))
-            if remaining == 0:
-                sleep_time = max(0, reset - int(time.time()))
-                print(f"Rate limit reached. Sleeping for {sleep_time} seconds.")
-                time.sleep(sleep_time)
-        results = []
-        if tweets.data:
-            for tweet in tweets.data:
-                results.append({
-                    "user": tweet.author_id,
-                    "content": tweet.text,
-                    "url": f"https://twitter.com/i/web/status/{tweet.id}",
-                    "date": tweet.created_at
-                })
-        return results
-    except tweepy.TooManyRequests as e:
-        # Tweepy will raise this if rate limit is hit and wait_on_rate_limit=False
-        print("Twitter API rate limit exceeded. Waiting before retry...")
-        reset_time = int(e.response.headers.get('x-rate-limit-reset', 0))
-        sleep_time = max(0, reset_time - int(time.time()))
-        time.sleep(sleep_time)
-        return run_twitter_search(keyword, limit)
+        tweets = client.search_recent_tweets(query=keyword, max_results=max(10, min(limit, 100)),
+                                             tweet_fields=["author_id", "created_at"])
+        return [_tweet_dict(t) for t in (tweets.data or [])][:limit]
+    except tweepy.TooManyRequests:
+        logging.warning("Twitter API rate limit exceeded; skipping search.")
+        return []
     except Exception as e:
-        print(f"Twitter API error: {e}")
+        logging.warning(f"Twitter API error: {e}")
         return []
+
+
+class TweetPoller:
+    """
+    Incremental recent-search poller.
+
+    Keeps a since_id cursor per keyword in a JSON state file, so each run only
+    downloads tweets newer than the last one seen. Keywords are searched
+    concurrently, each paginating up to max_pages. since_id only advances once a
+    keyword's pagination is exhausted; when the page budget runs out or the API
+    answers 429 first, the next_token is saved and the next run resumes there,
+    so no tweet between the old cursor and the newest one is skipped.
+    A 429 also records the reset time (persisted with the cursors); until then
+    searches are skipped rather than slept on. poll() yields (keyword, new
+    tweets) as each keyword finishes.
+    """
+
+    def __init__(self, cursor_path="twitter_cursors.json", max_pages=3, page_size=100, workers=4, client=None):
+        self.cursor_path = cursor_path
+        self.max_pages = max(1, int(max_pages))
+        self.page_size = max(10, min(int(page_size), 100))
+        self.workers = max(1, int(workers))
+        self._client = client
+        self._lock = threading.Lock()
+        self.cursors = {}
+        self.pending = {}
+        self.blocked_until = 0.0
+        self._load_state()
+
+    def _load_state(self):
+        try:
+            with open(self.cursor_path, "r") as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logging.warning(f"TweetPoller: could not read cursors {self.cursor_path}: {e}")
+            return
+        if "cursors" not in state:
+            # earlier format: a plain {keyword: since_id} mapping
+            state = {"cursors": state}
+        self.cursors = dict(state.get("cursors") or {})
+        self.pending = dict(state.get("pending") or {})
+        self.blocked_until = float(state.get("blocked_until") or 0.0)
+
+    def save_state(self):
+        with self._lock:
+            state = {"cursors": dict(self.cursors), "pending": dict(self.pending), "blocked_until": self.blocked_until}
+        tmp = self.cursor_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp, self.cursor_path)
+
+    def rate_limited(self):
+        return time.time() < self.blocked_until
+
+    def _search(self, client, keyword):
+        with self._lock:
+            since_id = self.cursors.get(keyword)
+            resume = self.pending.get(keyword) or {}
+        tweets = []
+        newest, next_token = resume.get("newest_id"), resume.get("next_token")
+        for _ in range(self.max_pages):
+            if self.rate_limited():
+                break
+            kwargs = {"query": keyword, "max_results": self.page_size, "tweet_fields": ["author_id", "created_at"]}
+            if since_id:
+                kwargs["since_id"] = since_id
+            if next_token:
+                kwargs["next_token"] = next_token
+            try:
+                page = client.search_recent_tweets(**kwargs)
+            except Exception as e:
+                if tweepy is not None and isinstance(e, tweepy.TooManyRequests):
+                    reset = int(e.response.headers.get("x-rate-limit-reset", 0) or 0)
+                    with self._lock:
+                        self.blocked_until = max(self.blocked_until, reset or time.time() + 60)
+                    logging.warning(f"TweetPoller: rate limited; skipping searches until {time.ctime(self.blocked_until)}.")
+                else:
+                    logging.warning(f"TweetPoller: search for '{keyword}' failed: {e}")
+                break
+            meta = page.meta or {}
+            if newest is None:
+                newest = meta.get("newest_id")
+            tweets.extend(_tweet_dict(t) for t in (page.data or []))
+            next_token = meta.get("next_token")
+            if not next_token:
+                break
+        with self._lock:
+            if newest and not next_token:
+                # pagination exhausted: everything up to `newest` has been seen
+                self.cursors[keyword] = str(newest)
+                self.pending.pop(keyword, None)
+            elif next_token:
+                # stopped early (budget or rate limit): resume from this page next run
+                self.pending[keyword] = {"newest_id": newest, "next_token": next_token}
+        return tweets
+
+    def poll(self, keywords):
+        """Yield (keyword, tweets) with only tweets newer than the keyword's cursor; state is saved at the end."""
+        client = self._client or get_client()
+        if client is None:
+            logging.warning("Twitter API bearer token not set. Set TWITTER_BEARER_TOKEN in your environment.")
+            return
+        if self.rate_limited():
+            logging.warning(f"TweetPoller: rate limited until {time.ctime(self.blocked_until)}; skipping this poll.")
+            return
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="tweets") as pool:
+                futures = {pool.submit(self._search, client, kw): kw for kw in keywords}
+                for fut in as_completed(futures):
+                    kw = futures[fut]
+                    try:
+                        tweets = fut.result()
+                    except Exception as e:
+                        logging.error(f"TweetPoller: polling '{kw}' failed: {e}", exc_info=True)
+                        continue
+                    yield kw, tweets
+        finally:
+            self.save_state()
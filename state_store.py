@@ -0,0 +1,127 @@
+# state_store.py
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS urls (
+    url TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS urls_status ON urls(status, updated_at);
+"""
+
+
+class StateStore:
+    """
+    Incremental scan state in an embedded SQLite database (WAL mode).
+
+    URL state changes ('queued' -> 'scanned') are written as they happen, so
+    saving state costs O(change) instead of rewriting the whole crawl.
+    Resuming reads only the queued rows; scanned membership is checked with
+    an indexed lookup rather than loaded into memory.
+    """
+
+    def __init__(self, path="scan_state.db"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            # WAL + NORMAL: commits are durable against app crashes without an fsync per write
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+
+    def enqueue(self, url):
+        """Record url as queued unless it is already known."""
+        with self._lock:
+            self._conn.execute("INSERT OR IGNORE INTO urls VALUES (?, 'queued', ?)", (url, time.time()))
+
+    def mark_scanned(self, url):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO urls VALUES (?, 'scanned', ?) "
+                "ON CONFLICT(url) DO UPDATE SET status='scanned', updated_at=excluded.updated_at",
+                (url, time.time()),
+            )
+
+    def is_scanned(self, url) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM urls WHERE url=? AND status='scanned'", (url,)).fetchone()
+        return row is not None
+
+    def scanned_count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM urls WHERE status='scanned'").fetchone()[0]
+
+    def queued(self) -> list:
+        """URLs still waiting to be scanned, oldest first."""
+        with self._lock:
+            rows = self._conn.execute("SELECT url FROM urls WHERE status='queued' ORDER BY updated_at").fetchall()
+        return [r[0] for r in rows]
+
+    def checkpoint(self):
+        """Fold the WAL back into the main database file (periodic compaction)."""
+        with self._lock:
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def import_json_state(self, json_path, on_finding=None) -> bool:
+        """
+        One-off migration of a legacy scan_state.json snapshot into the store.
+        Legacy findings are handed to `on_finding` (findings live in FindingsStore).
+        """
+        try:
+            with open(json_path, "r") as f:
+                state = json.load(f)
+        except Exception as e:
+            logging.error(f"StateStore: could not read legacy state {json_path}: {e}", exc_info=True)
+            return False
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.executemany("INSERT OR IGNORE INTO urls VALUES (?, 'scanned', ?)",
+                                   ((u, now) for u in state.get("scanned", [])))
+            self._conn.executemany("INSERT OR IGNORE INTO urls VALUES (?, 'queued', ?)",
+                                   ((u, now) for u in state.get("queue", [])))
+            self._conn.execute("COMMIT")
+        if on_finding is not None:
+            for record in state.get("findings", []):
+                on_finding(record)
+        return True
+
+    def scanned_view(self) -> "ScannedSet":
+        return ScannedSet(self)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def remove(path):
+        """Delete a state database and its WAL/shared-memory side files."""
+        removed = False
+        for p in (path, path + "-wal", path + "-shm"):
+            if os.path.exists(p):
+                os.remove(p)
+                removed = True
+        return removed
+
+
+class ScannedSet:
+    """Set-like view (in / add / len) over the scanned URLs in a StateStore."""
+
+    def __init__(self, store: StateStore):
+        self._store = store
+
+    def __contains__(self, url):
+        return self._store.is_scanned(url)
+
+    def add(self, url):
+        self._store.mark_scanned(url)
+
+    def __len__(self):
+        return self._store.scanned_count()
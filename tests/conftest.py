@@ -2,6 +2,7 @@ import os
 import sys
 import types
 import pathlib
+import importlib.util
 
 # Ensure project root is importable
 PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
@@ -21,6 +22,13 @@ def _fake_semantic_similarity(text, templates):
             score += 1.0
     return min(score / max(1, len(templates or [])), 1.0)
 fake_scorer.semantic_similarity = _fake_semantic_similarity
+fake_scorer.configure = lambda model_name=None, backend=None: None
+fake_scorer.configure_cache = lambda path="embedding_cache", capacity=100000: None
+fake_scorer.close_cache = lambda: None
+fake_scorer.semantic_similarity_batch = lambda texts, templates, *args, **kwargs: [_fake_semantic_similarity(t, templates) for t in texts]
+fake_scorer.score_texts = lambda texts, templates, scam_index=None, *args, **kwargs: [
+    {"similarity": _fake_semantic_similarity(t, templates), "scam_score": 0.0, "scam_id": None, "embedding": None} for t in texts
+]
 sys.modules.setdefault("scorer", fake_scorer)
 
 # 2) fetcher (web fetching, screenshots, link extraction)
@@ -31,9 +39,20 @@ def _fake_extract_links(html, base):
     return []
 def _fake_take_screenshot(url, out_dir="screenshots", timeout=15):
     return ""
+def _fake_parse_page(html, base, parser=None):
+    return {"title": "", "text": html or "", "links": []}
 fake_fetcher.safe_get = _fake_safe_get
+fake_fetcher.parse_page = _fake_parse_page
 fake_fetcher.extract_links = _fake_extract_links
 fake_fetcher.take_screenshot = _fake_take_screenshot
+fake_fetcher.configure_fetcher = lambda concurrency=200, per_host=8, timeout=10: None
+fake_fetcher.shutdown_fetcher = lambda: None
+def _fake_http_session():
+    import requests
+    return requests.Session()
+fake_fetcher.http_session = _fake_http_session
+fake_fetcher.configure_browser_pool = lambda size=2, max_pages=50: None
+fake_fetcher.shutdown_browser_pool = lambda: None
 sys.modules.setdefault("fetcher", fake_fetcher)
 
 # 3) enrich (whois / ssl)
@@ -52,7 +71,14 @@ def _fake_run_twitter_search(keyword, limit=20):
     if "brand" in (keyword or "").lower() or "placeholder" in (keyword or "").lower():
         return [{"content": "BRAND_PLACEHOLDER is giving away free airtime"}]
     return []
+class _FakeTweetPoller:
+    def __init__(self, cursor_path="twitter_cursors.json", max_pages=3, page_size=100, workers=4, client=None):
+        pass
+    def poll(self, keywords):
+        for kw in keywords:
+            yield kw, _fake_run_twitter_search(kw)
 fake_social.run_twitter_search = _fake_run_twitter_search
+fake_social.TweetPoller = _FakeTweetPoller
 sys.modules.setdefault("social", fake_social)
 
 # 5) discovery - return sample suspicious domain
@@ -60,35 +86,29 @@ fake_discovery = types.SimpleNamespace()
 fake_discovery.get_suspicious_domains = lambda official, tlds, *args, **kwargs: ["safaric0m.co.ke"]
 sys.modules.setdefault("discovery", fake_discovery)
 
-# 6) storage - append_findings returns file paths
-fake_storage = types.SimpleNamespace()
-def _fake_append_findings(findings, csv_path=None, excel_path=None):
-    return [os.path.abspath(csv_path or "findings_demo.csv")]
-fake_storage.append_findings = _fake_append_findings
-sys.modules.setdefault("storage", fake_storage)
-
-# 7) alerting (teams/slack) - no-op
+# 6) alerting (teams/slack) - no-op
 fake_alerting = types.SimpleNamespace()
-fake_alerting.send_teams_alert = lambda msg: None
+fake_alerting.send_teams_alert = lambda msg, key=None: None
+fake_alerting.configure_alerts = lambda **kwargs: None
+fake_alerting.shutdown_alerts = lambda: None
 fake_alerting.send_slack_alert = lambda msg: None
 sys.modules.setdefault("alerting", fake_alerting)
 
-# 8) utils - is_typosquat
-fake_utils = types.SimpleNamespace()
-def _fake_is_typosquat(domain, official, threshold=85):
-    from rapidfuzz import fuzz
-    for official_d in official or []:
-        if fuzz.ratio(domain, official_d) > threshold:
-            return True
-    return False
-fake_utils.is_typosquat = _fake_is_typosquat
-sys.modules.setdefault("utils", fake_utils)
-
-# 9) pytest fixture for demo env
+# 7) pytest fixture for demo env
 import pytest
 @pytest.fixture(autouse=True)
 def demo_env(monkeypatch):
     monkeypatch.setenv("BRAND_NAME", os.environ.get("BRAND_NAME", "BRAND_PLACEHOLDER"))
     monkeypatch.delenv("WHOIS_API_KEY", raising=False)
     monkeypatch.delenv("TWITTER_BEARER_TOKEN", raising=False)
-    yield
\ No newline at end of file
+    yield
+
+# 8) the real implementation of a module stubbed above, loaded under "<name>_real"
+@pytest.fixture
+def load_real():
+    def load(name):
+        spec = importlib.util.spec_from_file_location(f"{name}_real", PROJECT_ROOT / f"{name}.py")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+    return load
@@ -0,0 +1,64 @@
+import time
+import types
+
+import pytest
+
+pytest.importorskip("requests")
+
+
+@pytest.fixture
+def alerting(load_real):
+    return load_real("alerting")
+
+
+def _response(status, headers=None):
+    return types.SimpleNamespace(status_code=status, headers=headers or {}, text="")
+
+
+def test_dedup_window_and_full_queue(alerting):
+    d = alerting.AlertDispatcher(webhook="http://hook.test", max_queue=1, dedup_window=0.2)
+    assert d.submit("a", key="a.test")
+    assert not d.submit("a again", key="a.test")  # suppressed
+    assert not d.submit("b", key="b.test")        # queue full: dropped, not remembered
+    d._queue.get_nowait()
+    assert d.submit("b", key="b.test")
+    assert d.stats == {"queued": 2, "suppressed": 1, "dropped": 1, "sent": 0, "failed": 0}
+
+    d._queue.get_nowait()
+    time.sleep(0.25)
+    assert d.submit("a after window", key="a.test")
+    assert "b.test" not in d._last_seen  # expired keys are pruned
+
+
+def test_digest_caps_lines(alerting):
+    d = alerting.AlertDispatcher(webhook="http://hook.test", max_digest_lines=2)
+    assert d._digest(["only"]) == "only"
+    text = d._digest(["one", "two", "three"])
+    assert text.startswith("3 brand monitoring alerts:")
+    assert "- one" in text and "- two" in text and "- three" not in text
+    assert text.endswith("- ... and 1 more")
+
+
+def test_send_retries_transient_errors_only(alerting, monkeypatch):
+    responses = [_response(500), _response(429, {"Retry-After": "0"}), _response(200)]
+    posts = []
+    monkeypatch.setattr(alerting.requests, "post", lambda url, json, timeout: posts.append(json) or responses.pop(0))
+    d = alerting.AlertDispatcher(webhook="http://hook.test", min_interval=0, backoff=0, max_retries=4)
+    assert d._send("hello")
+    assert len(posts) == 3 and d.stats["sent"] == 1
+
+    posts.clear()
+    monkeypatch.setattr(alerting.requests, "post", lambda url, json, timeout: posts.append(json) or _response(400))
+    assert not d._send("bad")
+    assert len(posts) == 1 and d.stats["failed"] == 1
+
+
+def test_dispatcher_coalesces_alerts_into_one_post(alerting, monkeypatch):
+    posts = []
+    monkeypatch.setattr(alerting.requests, "post", lambda url, json, timeout: posts.append(json["text"]) or _response(200))
+    d = alerting.AlertDispatcher(webhook="http://hook.test", flush_interval=0.2, min_interval=0).start()
+    for i in range(3):
+        d.submit(f"alert {i}", key=f"k{i}")
+    d.close()
+    assert len(posts) == 1
+    assert posts[0].startswith("3 brand monitoring alerts:")
@@ -0,0 +1,43 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+BODY = b"<html>" + b"x" * 500_000 + b"</html>\n"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/"
+    httpd.shutdown()
+
+
+def test_async_fetcher_reads_bodies_larger_than_one_chunk(server, load_real):
+    fetcher = load_real("fetcher")
+    engine = fetcher.AsyncFetcher(concurrency=4, per_host=2, timeout=10).start()
+    capped = fetcher.AsyncFetcher(concurrency=4, per_host=2, timeout=10, max_bytes=100_000).start()
+    try:
+        res = engine.fetch(server)
+        assert res["status"] == 200
+        assert len(res["text"]) == len(BODY)
+        assert len(capped.fetch(server)["text"]) == 100_000
+    finally:
+        engine.close()
+        capped.close()
@@ -0,0 +1,71 @@
+import itertools
+
+import pytest
+
+pytest.importorskip("bs4")
+pytest.importorskip("requests")
+
+
+class FakeDriver:
+    _ids = itertools.count(1)
+
+    def __init__(self):
+        self.id = next(self._ids)
+        self.quit_calls = 0
+
+    def quit(self):
+        self.quit_calls += 1
+
+
+@pytest.fixture
+def pool_factory(load_real, monkeypatch):
+    fetcher = load_real("fetcher")
+    created = []
+
+    def new_driver(self):
+        driver = FakeDriver()
+        created.append(driver)
+        return driver
+
+    monkeypatch.setattr(fetcher.BrowserPool, "_new_driver", new_driver)
+
+    def make(**kwargs):
+        return fetcher.BrowserPool(**kwargs), created
+    return make
+
+
+def _use(pool):
+    with pool.session() as driver:
+        return driver
+
+
+def test_session_is_reused_then_recycled_after_max_pages(pool_factory):
+    pool, created = pool_factory(size=1, max_pages=2)
+    first = _use(pool)
+    assert _use(pool) is first
+    assert first.quit_calls == 1  # recycled after its 2nd page
+    second = _use(pool)
+    assert second is not first
+    assert len(created) == 2
+
+
+def test_dead_driver_is_replaced(pool_factory):
+    pool, created = pool_factory(size=1, max_pages=10)
+    with pytest.raises(RuntimeError):
+        with pool.session() as driver:
+            raise RuntimeError("chrome crashed")
+    assert driver.quit_calls == 1
+    assert _use(pool) is not driver
+    assert len(created) == 2
+
+
+def test_close_quits_every_driver(pool_factory):
+    pool, created = pool_factory(size=2, max_pages=10)
+    with pool.session() as a:
+        with pool.session() as b:
+            assert a is not b
+    with pool.session() as busy:
+        pool.close()
+        assert busy.quit_calls == 0
+    # idle drivers are quit by close(), the busy one when it is handed back
+    assert [d.quit_calls for d in created] == [1, 1]
@@ -0,0 +1,29 @@
+from cascade import RiskCascade
+
+
+def test_cascade_prunes_low_risk_before_expensive_stages():
+    calls = []
+
+    def cheap(ctx):
+        calls.append(("cheap", ctx["url"]))
+        ctx["risk"] += ctx["signal"]
+
+    def expensive(ctx):
+        calls.append(("expensive", ctx["url"]))
+        ctx["risk"] += 0.5
+
+    cascade = RiskCascade.from_config(
+        [{"name": "cheap"}, {"name": "expensive", "threshold": 0.3}, {"name": "missing"}, {"name": "final", "threshold": 0.9}],
+        {"cheap": cheap, "expensive": expensive, "final": lambda ctx: None},
+    )
+    benign = cascade.run({"url": "a", "signal": 0.1})
+    risky = cascade.run({"url": "b", "signal": 0.6})
+
+    assert benign["pruned_at"] == "expensive" and benign["risk"] == 0.1
+    assert risky["pruned_at"] is None and risky["risk"] == 1.1
+    assert calls == [("cheap", "a"), ("cheap", "b"), ("expensive", "b")]
+    assert cascade.stats() == {
+        "cheap": {"run": 2, "pruned": 0},
+        "expensive": {"run": 1, "pruned": 1},
+        "final": {"run": 1, "pruned": 0},
+    }
@@ -0,0 +1,22 @@
+from confusables import SkeletonIndex, skeleton
+
+def test_skeleton_folds_homoglyphs_and_punycode():
+    assert skeleton("examp1e.com") == skeleton("example.com")
+    # Cyrillic 'а' and 'е'
+    assert skeleton("аpple.com") == skeleton("apple.com")
+    assert skeleton("xn--pple-43d.com") == skeleton("apple.com")
+    assert skeleton("rnicrosoft.com") == skeleton("microsoft.com")
+    assert skeleton("ｅｘａｍｐｌｅ.com") == skeleton("example.com")
+    assert skeleton("exámple.com") == skeleton("example.com")
+
+def test_skeleton_index_lookup():
+    index = SkeletonIndex(["example.com", "brandplaceholder.co.ke"])
+    assert index.lookup("examp1e.com") == "example.com"
+    assert index.lookup("xn--xample-2of.com") == "example.com"
+    assert index.lookup("login.brandp1aceh0lder.co.ke") == "brandplaceholder.co.ke"
+    # TLD swap keeps the brand label
+    assert index.lookup("brandplaceholder.xyz") == "brandplaceholder.co.ke"
+    # official domains and their subdomains are not lookalikes
+    assert index.lookup("example.com") is None
+    assert index.lookup("www.example.com") is None
+    assert index.lookup("unrelated-site.com") is None
@@ -0,0 +1,41 @@
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("whois")
+
+
+@pytest.fixture
+def discovery(load_real, monkeypatch):
+    module = load_real("discovery")
+    looked_up = []
+
+    def fake_whois(domain):
+        looked_up.append(domain)
+        raise RuntimeError("no whois in tests")
+
+    monkeypatch.setattr(module.whois, "whois", fake_whois)
+    module.looked_up = looked_up
+    return module
+
+
+class _RejectAll:
+    def filter_resolvable(self, domains):
+        return []
+
+
+def _sweep(discovery, **kwargs):
+    discovery.looked_up.clear()
+    found = discovery.get_suspicious_domains(["safaricom.co.ke"], [".xyz"], workers=2,
+                                             whois_rate_per_server=1000.0, **kwargs)
+    return found, list(discovery.looked_up)
+
+
+def test_permutations_need_a_resolver(discovery):
+    _, simple = _sweep(discovery)
+    _, without_resolver = _sweep(discovery, permutations=True)
+    assert sorted(without_resolver) == sorted(simple)
+
+
+def test_resolver_filters_permutations_before_whois(discovery):
+    found, looked_up = _sweep(discovery, permutations=True, resolver=_RejectAll())
+    assert found == [] and looked_up == []
@@ -0,0 +1,54 @@
+import threading
+
+import pytest
+
+np = pytest.importorskip("numpy")
+from embedding_cache import EmbeddingCache, cache_key
+
+
+def test_cache_key_normalizes_whitespace_and_includes_model():
+    assert cache_key("m", "Free  airtime\n") == cache_key("m", "Free airtime")
+    assert cache_key("m", "Free airtime") != cache_key("other", "Free airtime")
+
+
+def test_cache_persists_and_evicts_least_recently_used(tmp_path):
+    path = str(tmp_path / "emb")
+    cache = EmbeddingCache(path, capacity=3)
+    vecs = np.eye(4, dtype=np.float32)
+    cache.put_many(["a", "b", "c"], vecs[:3])
+    assert set(cache.get_many(["a", "c"])) == {"a", "c"}  # 'b' is now least recently used
+    cache.put_many(["d"], vecs[3:])
+    assert len(cache) == 3
+    assert set(cache.get_many(["a", "b", "c", "d"])) == {"a", "c", "d"}
+    cache.close()
+
+    cache = EmbeddingCache(path, capacity=3)
+    got = cache.get_many(["d", "x"])
+    assert list(got) == ["d"]
+    np.testing.assert_array_equal(got["d"], vecs[3])
+    assert cache.stats() == {"hits": 1, "misses": 1}
+    cache.close()
+
+
+def test_cache_is_safe_for_concurrent_workers(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "emb"), capacity=1000)
+    errors = []
+
+    def worker(n):
+        try:
+            for i in range(50):
+                key = f"t{(n * 50 + i) % 120}"
+                if key not in cache.get_many([key]):
+                    cache.put_many([key], np.full((1, 8), hash(key) % 7, dtype=np.float32))
+        except Exception as e:  # pragma: no cover - surfaced by the assert below
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    assert len(cache) == 120
+    assert cache.get_many(["t5"])["t5"][0] == hash("t5") % 7
+    cache.close()
@@ -0,0 +1,65 @@
+import threading
+import time
+from enrich_cache import EnrichmentCache, registrable_domain
+
+def test_registrable_domain_strips_subdomains_and_ports():
+    assert registrable_domain("login.secure.example.com:443") == "example.com"
+    assert registrable_domain("EXAMPLE.com.") == "example.com"
+
+def test_cache_hits_by_registrable_domain_and_persists(tmp_path):
+    path = str(tmp_path / "cache.db")
+    calls = []
+    def lookup(domain):
+        calls.append(domain)
+        return {"registrar": "demo", "domain": domain}
+
+    cache = EnrichmentCache(path)
+    first = cache.get("whois", "a.example.com", lookup)
+    second = cache.get("whois", "b.example.com", lookup)
+    assert first == second == {"registrar": "demo", "domain": "a.example.com"}
+    assert calls == ["a.example.com"]
+    assert cache.stats()["whois"]["hits"] == 1
+    cache.close()
+
+    cache = EnrichmentCache(path)
+    cache.get("whois", "example.com", lookup)
+    assert calls == ["a.example.com"]
+    # separate signal types have separate entries
+    cache.get("ssl", "example.com", lookup)
+    assert calls == ["a.example.com", "example.com"]
+    cache.close()
+
+def test_cache_negative_entries_expire(tmp_path):
+    calls = []
+    def failing(domain):
+        calls.append(domain)
+        raise OSError("connection refused")
+
+    cache = EnrichmentCache(str(tmp_path / "cache.db"), negative_ttl=0.05)
+    assert "error" in cache.get("ssl", "bad.test", failing)
+    assert "error" in cache.get("ssl", "bad.test", failing)
+    assert len(calls) == 1
+    time.sleep(0.1)
+    cache.get("ssl", "bad.test", failing)
+    assert len(calls) == 2
+    assert cache.stats()["ssl"]["errors"] == 2
+    cache.close()
+
+def test_concurrent_lookups_are_coalesced(tmp_path):
+    calls = []
+    def slow(domain):
+        calls.append(domain)
+        time.sleep(0.2)
+        return {"ok": True}
+
+    cache = EnrichmentCache(str(tmp_path / "cache.db"))
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get("whois", "x.example.org", slow))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+    assert results == [{"ok": True}] * 5
+    assert cache.stats()["whois"]["coalesced"] == 4
+    cache.close()
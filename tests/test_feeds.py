@@ -0,0 +1,59 @@
+from feeds import stream_phishtank
+
+class _Response:
+    def __init__(self, status, lines=(), headers=None):
+        self.status_code = status
+        self._lines = lines
+        self.headers = headers or {}
+        self.encoding = None
+        self.consumed = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(self.status_code)
+
+    def iter_lines(self, decode_unicode=False):
+        for line in self._lines:
+            self.consumed += 1
+            yield line
+
+class _Session:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None, stream=False):
+        self.requests.append(headers)
+        return self.responses.pop(0)
+
+FEED = ["phish_id,url,target", "1,http://examp1e.xyz/login,Other", "2,http://unrelated.test/,Other"]
+
+def test_stream_phishtank_streams_rows_then_uses_conditional_get(tmp_path):
+    cache = str(tmp_path / "feed.csv")
+    first = _Response(200, FEED, {"ETag": '"v1"', "Last-Modified": "Sat, 17 Oct 2026 10:00:00 GMT"})
+    session = _Session([first, _Response(304)])
+
+    rows = stream_phishtank(session, cache_path=cache)
+    row = next(rows)
+    # the first row is available before the body has been fully read
+    assert row["url"] == "http://examp1e.xyz/login"
+    assert first.consumed < len(FEED)
+    assert [r["phish_id"] for r in rows] == ["2"]
+    assert open(cache).read().splitlines() == FEED
+
+    assert list(stream_phishtank(session, cache_path=cache)) == []
+    assert session.requests[1] == {"If-None-Match": '"v1"', "If-Modified-Since": "Sat, 17 Oct 2026 10:00:00 GMT"}
+
+def test_stream_phishtank_keeps_cache_on_interrupted_download(tmp_path):
+    cache = tmp_path / "feed.csv"
+    rows = stream_phishtank(_Session([_Response(200, FEED, {"ETag": '"v2"'})]), cache_path=str(cache))
+    next(rows)
+    rows.close()
+    assert not cache.exists()
+    assert not (tmp_path / "feed.csv.part").exists()
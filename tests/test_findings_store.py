@@ -0,0 +1,30 @@
+from findings_store import FindingsStore
+
+
+def test_findings_store_types_columns_and_filters(tmp_path):
+    store = FindingsStore(str(tmp_path / "findings.db"), chunk_size=2)
+    store.add({
+        "url": "http://brand-login.xyz", "domain": "brand-login.xyz", "similarity": 0.9, "risk": 0.8,
+        "whois": {"WhoisRecord": {"registrarName": "NameCheap", "registryData": {"createdDate": "2024-01-01"}}},
+        "ssl": {"issuer": ((("organizationName", "Let's Encrypt"),), (("commonName", "R3"),)), "notAfter": "Jan 1 2030"},
+        "finding_tag": "x", "finding_id": "abc123",
+    })
+    store.add({"url": "http://other.test", "risk": 0.1, "whois": {"error": "no key"}, "ssl": {"error": "timeout"}})
+    store.add({"type": "tweet", "keyword": "m-pesa", "text": "free money", "score": 0.9})
+    store.close()
+
+    store = FindingsStore(str(tmp_path / "findings.db"))
+    assert store.count() == 3
+    page = next(store.query(min_risk=0.5, kind="page"))
+    assert page["whois_registrar"] == "NameCheap"
+    assert page["whois_created"] == "2024-01-01"
+    assert page["ssl_issuer"] == "organizationName=Let's Encrypt, commonName=R3"
+    assert page["extra"] == '{"finding_tag": "x"}'
+    assert page["finding_id"] == "abc123"
+    assert [r["whois_error"] for r in store.query(min_risk=0, kind="page")] == [None, "no key"]
+    assert [r["type"] for r in store.query(min_risk=0.5)] == ["page", "tweet"]
+    assert list(store.query(since="2999-01-01")) == []
+
+    out = store.export(str(tmp_path / "view.csv"), min_risk=0.5)
+    assert out and open(out).read().count("\n") == 3
+    store.close()
@@ -0,0 +1,31 @@
+from frontier import Frontier, BloomFilter, canonicalize_url
+
+def test_canonicalize_url_variants():
+    assert canonicalize_url("HTTP://Example.COM:80/login/#top") == "http://example.com/login"
+    assert canonicalize_url("https://example.com") == "https://example.com/"
+    assert canonicalize_url("example.com/a?b=2&a=1") == "http://example.com/a?a=1&b=2"
+    assert canonicalize_url("mailto:someone@example.com") == ""
+
+def test_frontier_dedups_across_queued_and_known():
+    pushed = []
+    frontier = Frontier(known=lambda url: url == "http://scanned.test/", on_push=pushed.append)
+    assert frontier.push("http://example.com/login")
+    assert not frontier.push("https://EXAMPLE.com/login/#x")
+    assert not frontier.push("http://scanned.test")
+    frontier.mark_seen("http://other.test/")
+    assert not frontier.push("http://other.test")
+    assert frontier.seen("http://example.com/login/")
+    assert pushed == ["http://example.com/login"]
+    assert frontier.qsize() == 1
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000, error_rate=0.01)
+    keys = [f"host{i}.test/" for i in range(1000)]
+    for k in keys:
+        bloom.add(k)
+    assert all(k in bloom for k in keys)
+    false_positives = sum(f"other{i}.test/" in bloom for i in range(1000))
+    assert false_positives < 50
+    frontier = Frontier(seen=BloomFilter(100))
+    assert frontier.push("http://a.test/x")
+    assert not frontier.push("http://a.test/x/")
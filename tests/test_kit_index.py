@@ -0,0 +1,33 @@
+from kit_index import KitIndex, hamming
+
+KIT = ("Welcome to BRAND_PLACEHOLDER online banking. Your account has been suspended. "
+       "Please verify your identity by entering your customer number, PIN and the one time "
+       "password sent to your phone. Failure to verify within 24 hours will lock your account. "
+       "Support reference 10293. Customer number. PIN. One time password. Verify now. "
+       "Forgot your PIN? Call customer care on 0722 000 000 or visit any branch. For your security "
+       "never share your PIN or password with anyone, including bank staff. BRAND_PLACEHOLDER will "
+       "never ask you to confirm your details by email or SMS. Copyright 2024 BRAND_PLACEHOLDER PLC. "
+       "All rights reserved. Terms and conditions apply. Privacy policy. Cookie settings. Contact us.")
+
+
+def test_kit_copies_on_other_hosts_are_found():
+    index = KitIndex(max_distance=3, min_tokens=20)
+    fp = index.fingerprint(KIT)
+    kit = index.add(fp, similarity=0.82, visual_score=0.9, visual_match="login.png", url="http://a.test")
+
+    # same kit, different reference number and a small template tweak
+    copy = KIT.replace("10293", "55817").replace("Welcome to", "Welcome to the")
+    found = index.lookup(index.fingerprint(copy))
+    assert found is kit
+    assert (found.similarity, found.visual_score, found.cluster_id) == (0.82, 0.9, "kit-0001")
+    assert found.members == 2
+
+    other = index.fingerprint("Fresh vegetables delivered daily " * 5 + "order online and pay on delivery in Nairobi and Mombasa today")
+    assert index.lookup(other) is None
+    assert hamming(fp, other) > 3
+
+
+def test_short_pages_are_not_fingerprinted():
+    index = KitIndex(min_tokens=20)
+    assert index.fingerprint("Index of /") is None
+    assert index.lookup(None) is None
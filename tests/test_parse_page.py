@@ -0,0 +1,32 @@
+import pytest
+
+pytest.importorskip("bs4")
+pytest.importorskip("requests")
+
+HTML = """<html><head><title> Brand Login </title><style>.x{color:red}</style></head>
+<body><script>var secret = 1;</script><noscript>enable js</noscript>
+<h1>Verify   your account</h1><p>Enter your PIN</p>
+<a href="/claim">claim</a><a href="https://other.test/x">other</a>
+<a href="mailto:help@brand.test">mail</a><a href="javascript:void(0)">js</a>
+</body></html>"""
+
+
+@pytest.fixture
+def fetcher(load_real):
+    return load_real("fetcher")
+
+
+def test_parse_page_title_text_and_links(fetcher):
+    page = fetcher.parse_page(HTML, "https://brand.test/login/")
+    assert page["title"] == "Brand Login"
+    # hidden tags are dropped and whitespace is collapsed
+    assert page["text"] == "Verify your account Enter your PIN claim other mail js"
+    assert sorted(page["links"]) == ["https://brand.test/claim", "https://other.test/x"]
+
+
+def test_parse_page_falls_back_when_parser_is_missing(fetcher, caplog):
+    page = fetcher.parse_page(HTML, "https://brand.test/", parser="no-such-parser")
+    fetcher.parse_page(HTML, "https://brand.test/", parser="no-such-parser")
+    assert page["title"] == "Brand Login"
+    assert len(page["links"]) == 2
+    assert sum("no-such-parser" in r.getMessage() for r in caplog.records) == 1
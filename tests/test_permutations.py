@@ -0,0 +1,26 @@
+from permutations import iter_permutations
+
+def test_permutations_cover_fuzzers_and_dedupe():
+    candidates = list(iter_permutations(["example.com", "example.org"], tlds=["xyz", ".top"]))
+    assert len(candidates) == len(set(candidates))
+    assert "example.com" not in candidates and "example.org" not in candidates
+    for expected in (
+        "exmple.com",      # omission
+        "xeample.com",     # transposition
+        "exaample.com",    # repetition
+        "ex-ample.com",    # hyphenation
+        "exa.mple.com",    # subdomain
+        "exampl3.com",     # replacement (keyboard neighbour)
+        "example.xyz",     # tld-swap
+        "example.top",
+        "ezample.com",     # bitsquatting x -> z
+        "exampie.org",     # homoglyph l -> i
+    ):
+        assert expected in candidates, expected
+    # IDN homoglyphs come out punycode-encoded
+    assert any(c.startswith("xn--") for c in candidates)
+
+def test_permutations_are_lazy_and_selectable():
+    gen = iter_permutations(["example.com"], fuzzers=["omission"])
+    assert next(gen) == "xample.com"
+    assert sorted(iter_permutations(["ab.com"], fuzzers=["transposition"])) == ["ba.com"]
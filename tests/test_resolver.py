@@ -0,0 +1,38 @@
+import asyncio
+from resolver import BulkResolver, NXDomain
+
+ZONE = {
+    "example.com": {"A": ["93.184.216.34"], "NS": ["a.iana-servers.net."]},
+    "examp1e.com": {"A": ["203.0.113.7"]},
+}
+
+def _stub_resolver(calls, **kwargs):
+    async def query(domain, rdtype):
+        calls.append((domain, rdtype))
+        if domain == "slow.test":
+            await asyncio.sleep(1)
+        if domain not in ZONE and domain != "slow.test":
+            raise NXDomain(domain)
+        return ZONE.get(domain, {}).get(rdtype, [])
+    return BulkResolver(query=query, **kwargs)
+
+def test_bulk_resolver_drops_nxdomain_and_caches_it():
+    calls = []
+    resolver = _stub_resolver(calls, timeout=0.1)
+    results = resolver.resolve_many(["example.com", "gone.test", "examp1e.com"])
+    assert results["example.com"]["A"] == ["93.184.216.34"]
+    assert results["gone.test"] is None
+    assert resolver.filter_resolvable(["gone.test", "examp1e.com", "example.com"]) == ["examp1e.com", "example.com"]
+    # NXDOMAIN answered from the negative cache the second time
+    assert sum(1 for d, _ in calls if d == "gone.test") == 1
+    assert resolver.nxdomain == 1
+
+def test_bulk_resolver_keeps_domains_on_timeout():
+    resolver = _stub_resolver([], timeout=0.05, rdtypes=("A",))
+    assert resolver.filter_resolvable(["slow.test"]) == ["slow.test"]
+
+def test_bulk_resolver_stops_at_first_answer():
+    calls = []
+    resolver = _stub_resolver(calls)
+    assert resolver.resolve_many(["example.com"])["example.com"] == {"A": ["93.184.216.34"]}
+    assert calls == [("example.com", "A")]
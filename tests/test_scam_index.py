@@ -0,0 +1,50 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+from scam_index import ScamIndex
+
+
+def test_scam_index_top_k_and_persistence(tmp_path):
+    rng = np.random.default_rng(1)
+    known = rng.normal(size=(40, 16)).astype(np.float32)
+    path = str(tmp_path / "scams.npz")
+    index = ScamIndex(path)
+    for i, v in enumerate(known):
+        assert index.add(f"f{i}", v)
+    assert not index.add("f0", known[0])
+    assert len(index) == 40
+
+    queries = known[[7, 23]] + rng.normal(scale=0.05, size=(2, 16)).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    scores, ids = index.search(queries, k=3)
+    assert [row[0] for row in ids] == ["f7", "f23"]
+    assert scores.shape == (2, 3)
+    assert (np.diff(scores, axis=1) <= 0).all()
+    assert scores[0, 0] > 0.95
+    index.save()
+
+    reloaded = ScamIndex(path)
+    assert len(reloaded) == 40
+    assert reloaded.search(queries[:1])[1] == [["f7"]]
+
+
+def test_empty_scam_index_returns_no_matches():
+    scores, ids = ScamIndex().search(np.ones((2, 4)), k=5)
+    assert scores.shape == (2, 0) and ids == [[], []]
+
+
+def test_scam_index_is_tied_to_the_encoder_model(tmp_path):
+    path = str(tmp_path / "scams.npz")
+    index = ScamIndex(path, model_id="model-a")
+    index.add("f1", np.ones(8))
+    index.save()
+    assert len(ScamIndex(path, model_id="model-a")) == 1
+
+    # switching models starts a fresh index instead of failing every search
+    other = ScamIndex(path, model_id="model-b")
+    assert len(other) == 0
+    assert other.search(np.ones((1, 4)))[1] == [[]]
+    other.add("g1", np.ones(4))
+    assert not other.add("g2", np.ones(8))
+    assert other.search(np.ones((1, 8)))[1] == [[]]
+    assert other.search(np.ones((1, 4)))[1] == [["g1"]]
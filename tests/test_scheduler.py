@@ -0,0 +1,65 @@
+import queue
+import threading
+import time
+from scheduler import CrawlScheduler
+
+def test_scheduler_processes_discovered_links_without_batch_barrier():
+    frontier = queue.Queue()
+    for url in ("slow", "a", "b"):
+        frontier.put(url)
+    done = []
+    lock = threading.Lock()
+
+    def process(url, res):
+        if url == "slow":
+            time.sleep(0.3)
+        elif url in ("a", "b"):
+            # newly discovered links go straight back to the frontier
+            frontier.put(url + "-child")
+        with lock:
+            done.append(url)
+        return {"url": url}
+
+    results = []
+    CrawlScheduler(frontier, process, workers=3, on_result=results.append).run()
+
+    assert sorted(done) == ["a", "a-child", "b", "b-child", "slow"]
+    # children of fast pages finish before the slow page, no batch barrier
+    assert done[-1] == "slow"
+    assert len(results) == 5
+
+def test_scheduler_uses_fetch_futures_and_checkpoints():
+    from concurrent.futures import ThreadPoolExecutor
+    frontier = queue.Queue()
+    for i in range(10):
+        frontier.put(f"u{i}")
+    seen = {}
+    checkpoints = []
+    with ThreadPoolExecutor(4) as pool:
+        sched = CrawlScheduler(
+            frontier,
+            lambda url, res: seen.setdefault(url, res),
+            workers=2,
+            fetch=lambda url: pool.submit(lambda: {"status": 200, "url": url}),
+            max_in_flight=8,
+            checkpoint=lambda: checkpoints.append(1),
+            checkpoint_every=0,
+        )
+        sched.run()
+    assert seen == {f"u{i}": {"status": 200, "url": f"u{i}"} for i in range(10)}
+    assert checkpoints
+    assert sched.in_flight() == []
+
+def test_scheduler_waits_for_streaming_sources():
+    frontier = queue.Queue()
+    done = []
+
+    def source():
+        for i in range(3):
+            time.sleep(0.05)
+            frontier.put(f"found{i}")
+
+    sched = CrawlScheduler(frontier, lambda url, res: done.append(url), workers=2)
+    sched.add_source(source, name="discovery")
+    sched.run()
+    assert sorted(done) == ["found0", "found1", "found2"]
@@ -0,0 +1,71 @@
+import zlib
+
+import pytest
+
+np = pytest.importorskip("numpy")
+from scam_index import ScamIndex
+
+
+class FakeEncoder:
+    """Deterministic unit vectors per text; records every encode() batch."""
+
+    def __init__(self):
+        self.batches = []
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True, normalize_embeddings=True):
+        texts = list(texts)
+        self.batches.append(texts)
+        vecs = np.stack([np.random.default_rng(zlib.crc32(t.encode())).normal(size=8) for t in texts])
+        return vecs / np.linalg.norm(vecs, axis=1, keepdims=True)
+
+
+@pytest.fixture
+def scorer(load_real, monkeypatch):
+    module = load_real("scorer")
+    encoder = FakeEncoder()
+    loads = []
+
+    def load_model(model_name, backend):
+        loads.append(backend)
+        if backend != "torch":
+            raise RuntimeError(f"{backend} not available")
+        return encoder
+
+    monkeypatch.setattr(module, "_load_model", load_model)
+    module.encoder, module.loads = encoder, loads
+    yield module
+    module.close_cache()
+
+
+def test_failed_int8_load_falls_back_to_torch_and_keys_cache_by_it(scorer, tmp_path):
+    scorer.configure(model_name="fake-model", backend="int8")
+    cache = scorer.configure_cache(str(tmp_path / "emb"))
+    vecs = scorer.embed_texts(["win a prize", "hello", "win a prize"])
+
+    assert scorer.BACKEND == "torch"
+    assert scorer.loads == ["int8", "torch"]
+    # repeated texts are encoded once, in a single batch
+    assert scorer.encoder.batches == [["win a prize", "hello"]]
+    assert np.allclose(vecs[0], vecs[2])
+
+    torch_key = scorer.cache_key("fake-model:torch", "hello")
+    assert torch_key in cache.get_many([torch_key])
+    assert not cache.get_many([scorer.cache_key("fake-model:int8", "hello")])
+
+    # cached texts skip the encoder
+    scorer.embed_texts(["hello"])
+    assert len(scorer.encoder.batches) == 1
+
+
+def test_score_texts_matches_templates_and_known_scams(scorer):
+    scam_index = ScamIndex()
+    scorer.configure(model_name="fake-model", backend="torch")
+    templates = ["claim your prize"]
+    scam_index.add("f1", scorer.embed_texts(["send bitcoin to double it"])[0])
+
+    results = scorer.score_texts(["claim your prize", "send bitcoin to double it"], templates, scam_index=scam_index)
+    assert results[0]["similarity"] == pytest.approx(1.0, abs=1e-5)
+    assert results[0]["scam_id"] is None
+    assert results[1]["scam_id"] == "f1"
+    assert results[1]["scam_score"] == pytest.approx(1.0, abs=1e-5)
+    assert results[1]["embedding"].shape == (8,)
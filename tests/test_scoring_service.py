@@ -0,0 +1,32 @@
+import threading
+import pytest
+from scoring_service import ScoringService
+
+def test_scoring_service_batches_across_threads():
+    batch_sizes = []
+    def score_fn(texts):
+        batch_sizes.append(len(texts))
+        return [len(t) / 10.0 for t in texts]
+
+    with ScoringService(score_fn, max_batch_size=8, max_wait=0.05) as svc:
+        results = {}
+        def worker(i):
+            results[i] = svc.score("x" * i)
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(16)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    assert results == {i: i / 10.0 for i in range(16)}
+    assert sum(batch_sizes) == 16
+    assert max(batch_sizes) <= 8
+    assert len(batch_sizes) < 16
+
+def test_scoring_service_propagates_errors():
+    def score_fn(texts):
+        raise ValueError("model failed")
+
+    with ScoringService(score_fn, max_wait=0) as svc:
+        with pytest.raises(ValueError):
+            svc.score("text")
@@ -0,0 +1,90 @@
+import time
+import types
+
+import pytest
+
+
+class TooManyRequests(Exception):
+    def __init__(self, reset):
+        super().__init__("429")
+        self.response = types.SimpleNamespace(headers={"x-rate-limit-reset": str(reset)})
+
+
+class FakeClient:
+    """Recent search over a fixed timeline of tweet ids, newest first, two per page."""
+
+    def __init__(self, ids, fail_on_call=None, reset=0):
+        self.ids = sorted(ids, reverse=True)
+        self.calls = []
+        self.fail_on_call = fail_on_call
+        self.reset = reset
+
+    def search_recent_tweets(self, query, max_results, tweet_fields, since_id=None, next_token=None):
+        self.calls.append({"since_id": since_id, "next_token": next_token})
+        if self.fail_on_call == len(self.calls):
+            raise TooManyRequests(self.reset)
+        ids = [i for i in self.ids if since_id is None or i > int(since_id)]
+        # like the real API, a token points at a fixed position in the timeline
+        older = [i for i in ids if next_token is None or i < int(next_token)]
+        page = older[:2]
+        meta = {"newest_id": str(page[0])} if page else {}
+        if len(older) > 2:
+            meta["next_token"] = str(page[-1])
+        data = [types.SimpleNamespace(id=i, author_id=1, text=f"tweet {i}", created_at=None) for i in page]
+        return types.SimpleNamespace(data=data or None, meta=meta)
+
+
+@pytest.fixture
+def social(load_real, monkeypatch):
+    module = load_real("social")
+    monkeypatch.setattr(module, "tweepy", types.SimpleNamespace(TooManyRequests=TooManyRequests))
+    return module
+
+
+def _poll(poller, keywords=("kw",)):
+    return {kw: [t["id"] for t in tweets] for kw, tweets in poller.poll(list(keywords))}
+
+
+def test_cursor_advances_only_after_pagination_is_exhausted(social, tmp_path):
+    path = str(tmp_path / "cursors.json")
+    client = FakeClient(range(1, 6))
+    # budget of 2 pages cannot cover 5 tweets: resume token is saved, cursor untouched
+    poller = social.TweetPoller(path, max_pages=2, client=client)
+    assert _poll(poller) == {"kw": ["5", "4", "3", "2"]}
+    assert "kw" not in poller.cursors
+
+    client.ids = sorted(range(1, 8), reverse=True)  # new tweets arrive in between
+    poller = social.TweetPoller(path, max_pages=2, client=client)
+    assert _poll(poller) == {"kw": ["1"]}
+    assert poller.cursors == {"kw": "5"} and poller.pending == {}
+
+    poller = social.TweetPoller(path, max_pages=2, client=client)
+    assert _poll(poller) == {"kw": ["7", "6"]}
+    assert poller.cursors == {"kw": "7"}
+
+
+def test_rate_limit_is_persisted_and_skips_without_sleeping(social, tmp_path):
+    path = str(tmp_path / "cursors.json")
+    reset = int(time.time()) + 600
+    client = FakeClient(range(1, 6), fail_on_call=2, reset=reset)
+    poller = social.TweetPoller(path, max_pages=3, workers=1, client=client)
+    assert _poll(poller) == {"kw": ["5", "4"]}
+    assert poller.pending["kw"]["next_token"] == "4"
+    assert "kw" not in poller.cursors
+
+    # a fresh poller (next run) sees the reset time and does not call the API
+    poller = social.TweetPoller(path, client=client)
+    assert poller.rate_limited()
+    start = time.monotonic()
+    assert _poll(poller, ["kw", "other"]) == {}
+    assert time.monotonic() - start < 1
+    assert len(client.calls) == 2
+
+
+def test_reads_legacy_cursor_file(social, tmp_path):
+    path = tmp_path / "cursors.json"
+    path.write_text('{"kw": "3"}')
+    client = FakeClient(range(1, 6))
+    poller = social.TweetPoller(str(path), client=client)
+    assert _poll(poller) == {"kw": ["5", "4"]}
+    assert client.calls[0]["since_id"] == "3"
@@ -0,0 +1,33 @@
+import json
+from state_store import StateStore
+
+def test_state_store_resumes_frontier(tmp_path):
+    path = str(tmp_path / "state.db")
+    store = StateStore(path)
+    for url in ("http://a.test", "http://b.test", "http://c.test"):
+        store.enqueue(url)
+    scanned = store.scanned_view()
+    scanned.add("http://a.test")
+    # re-queueing a scanned URL must not resurrect it
+    store.enqueue("http://a.test")
+    store.close()
+
+    store = StateStore(path)
+    assert store.queued() == ["http://b.test", "http://c.test"]
+    assert "http://a.test" in store.scanned_view()
+    assert "http://b.test" not in store.scanned_view()
+    assert len(store.scanned_view()) == 1
+    store.checkpoint()
+    store.close()
+
+def test_state_store_imports_legacy_json(tmp_path):
+    legacy = tmp_path / "scan_state.json"
+    legacy.write_text(json.dumps({"findings": [{"url": "http://x.test"}], "scanned": ["http://x.test"], "queue": ["http://y.test"]}))
+    store = StateStore(str(tmp_path / "state.db"))
+    legacy_findings = []
+    assert store.import_json_state(str(legacy), on_finding=legacy_findings.append)
+    assert store.queued() == ["http://y.test"]
+    assert store.is_scanned("http://x.test")
+    assert legacy_findings == [{"url": "http://x.test"}]
+    store.close()
+    assert StateStore.remove(str(tmp_path / "state.db"))
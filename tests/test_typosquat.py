@@ -1,7 +1,18 @@
 import pytest
-from utils import is_typosquat
+from utils import best_typosquat_matches, is_typosquat
 
 def test_typosquat_detects_similar():
     official = ["brandplaceholder.com", "example.com"]
     assert is_typosquat("brandplaceh0lder.com", official, threshold=60)
-    assert not is_typosquat("unrelated-site.com", official, threshold=60)
\ No newline at end of file
+    assert not is_typosquat("unrelated-site.com", official, threshold=60)
+
+def test_best_typosquat_matches_agrees_with_is_typosquat():
+    pytest.importorskip("numpy")  # rapidfuzz.process.cdist returns a numpy array
+    official = ["brandplaceholder.com", "example.com"]
+    domains = ["brandplaceh0lder.com", "examp1e.com", "unrelated-site.com"]
+    matches = best_typosquat_matches(domains, official, threshold=60)
+    assert [m for m, _ in matches] == ["brandplaceholder.com", "example.com", None]
+    assert all(0 <= score <= 100 for _, score in matches)
+    assert [m is not None for m, _ in matches] == [is_typosquat(d, official, threshold=60) for d in domains]
+    assert best_typosquat_matches(domains, [], threshold=60) == [(None, 0.0)] * 3
+    assert best_typosquat_matches([], official) == []
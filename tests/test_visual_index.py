@@ -0,0 +1,47 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+from visual_index import VisualIndex, dhash, phash
+
+
+def _login_page(shift=0.0):
+    img = np.tile(np.linspace(200.0, 250.0, 800), (600, 1))  # background gradient
+    img[:80] = 30 + shift          # header bar
+    img[200:260, 250:550] = 200    # username box
+    img[300:360, 250:550] = 200    # password box
+    img[400:450, 300:500] = 60     # button
+    return img
+
+
+def test_visual_index_matches_closest_baseline():
+    rng = np.random.default_rng(0)
+    stripes = np.tile(np.repeat([0.0, 255.0], 50), 8)[None, :].repeat(600, axis=0)
+    index = VisualIndex()
+    index.add("brand_login.png", _login_page())
+    index.add("stripes.png", stripes)
+    assert len(index) == 2
+
+    # same page with a brightness shift and noise (re-rendered / recompressed)
+    shot = _login_page(shift=15) + rng.normal(0, 5, (600, 800))
+    score, name = index.match(shot)
+    assert name == "brand_login.png"
+    assert score > 0.9
+
+
+
+def test_unrelated_pages_score_about_zero():
+    rng = np.random.default_rng(2)
+    index = VisualIndex()
+    index.add("brand_login.png", _login_page())
+    text_only = np.full((600, 800), 255.0)
+    for row in range(40, 580, 20):
+        text_only[row:row + 8, 40:rng.integers(200, 760)] = 0
+    unrelated = [rng.uniform(0, 255, (600, 800)), np.full((600, 800), 255.0), text_only]
+    assert all(s < 0.15 for img in unrelated for s in index.scores(img))
+    assert all(index.match(img) == (0.0, None) for img in unrelated)
+
+
+def test_hashes_are_64_bit():
+    img = _login_page()
+    assert dhash(img).shape == (8,) and phash(img).shape == (8,)
+    assert VisualIndex().match(img) == (0.0, None)
@@ -1,5 +1,5 @@
 import typing
-from rapidfuzz import fuzz
+from rapidfuzz import fuzz, process
 
 def is_typosquat(domain: str, official_domains: typing.Iterable[str], threshold: int = 85) -> bool:
     """
@@ -13,4 +13,25 @@ def is_typosquat(domain: str, official_domains: typing.Iterable[str], threshold:
         except Exception:
             # conservative: ignore errors and continue
             continue
-    return False
\ No newline at end of file
+    return False
+
+def best_typosquat_matches(domains: typing.Iterable[str], official_domains: typing.Iterable[str],
+                           threshold: int = 85, workers: int = -1) -> typing.List[typing.Tuple[typing.Optional[str], float]]:
+    """
+    Batch version of is_typosquat.
+    Scores every domain against every official domain in a single
+    rapidfuzz.process.cdist call (spread over `workers` cores, -1 = all).
+    Returns one (best_official, score) pair per input domain; best_official is
+    None unless the score is above threshold.
+    """
+    domains = list(domains)
+    officials = list(official_domains)
+    if not domains or not officials:
+        return [(None, 0.0)] * len(domains)
+    scores = process.cdist(domains, officials, scorer=fuzz.ratio, workers=workers)
+    best = scores.argmax(axis=1)
+    matches = []
+    for i, j in enumerate(best):
+        score = float(scores[i, j])
+        matches.append((officials[j] if score > threshold else None, score))
+    return matches
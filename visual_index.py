@@ -0,0 +1,136 @@
+# visual_index.py
+import logging
+import os
+
+import numpy as np
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp", ".bmp")
+HASH_SIZE = 8     # 8x8 -> 64-bit dHash / pHash
+VECTOR_SIZE = 32  # 32x32 downscaled grayscale feature vector
+
+
+def load_gray(path):
+    """Read an image as a 2-D grayscale array (cv2 is imported lazily). Returns None on failure."""
+    try:
+        import cv2
+    except Exception:
+        logging.warning("opencv-python not available - visual matching disabled.")
+        return None
+    img = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+    if img is None:
+        logging.warning(f"VisualIndex: could not read image {path}")
+    return img
+
+
+def _resize(gray, width, height):
+    """Area-average downscale (nearest-neighbour upscale) with NumPy only."""
+    a = np.asarray(gray, dtype=np.float32)
+    h, w = a.shape[:2]
+    if h >= height and w >= width:
+        rows = np.linspace(0, h, height + 1).astype(int)[:-1]
+        cols = np.linspace(0, w, width + 1).astype(int)[:-1]
+        sums = np.add.reduceat(np.add.reduceat(a, rows, axis=0), cols, axis=1)
+        counts = np.outer(np.diff(np.append(rows, h)), np.diff(np.append(cols, w)))
+        return sums / counts
+    rows = (np.arange(height) * h // height)
+    cols = (np.arange(width) * w // width)
+    return a[np.ix_(rows, cols)]
+
+
+def _dct_matrix(n):
+    k = np.arange(n)
+    m = np.cos(np.pi * (2 * k[None, :] + 1) * k[:, None] / (2 * n))
+    m[0] /= np.sqrt(2)
+    return m * np.sqrt(2.0 / n)
+
+
+_DCT = _dct_matrix(VECTOR_SIZE)
+
+
+def dhash(gray, hash_size=HASH_SIZE):
+    """Difference hash: sign of horizontal gradients, packed to bytes."""
+    small = _resize(gray, hash_size + 1, hash_size)
+    return np.packbits(small[:, 1:] > small[:, :-1])
+
+
+def phash(gray, hash_size=HASH_SIZE):
+    """DCT hash: low-frequency coefficients above their median, packed to bytes."""
+    small = _resize(gray, VECTOR_SIZE, VECTOR_SIZE)
+    low = (_DCT @ small @ _DCT.T)[:hash_size, :hash_size].flatten()
+    return np.packbits(low > np.median(low[1:]))
+
+
+def feature_vector(gray):
+    """Zero-mean, unit-norm 32x32 thumbnail (cosine = normalized cross-correlation)."""
+    v = _resize(gray, VECTOR_SIZE, VECTOR_SIZE).flatten()
+    v -= v.mean()
+    return v / (np.linalg.norm(v) + 1e-9)
+
+
+class VisualIndex:
+    """
+    Precomputed perceptual hashes (dHash + pHash) and thumbnail vectors for a set
+    of brand baseline screenshots. A new screenshot is hashed once and compared
+    against every baseline in a single vectorized Hamming / dot-product pass.
+    Matches scoring below min_score are treated as no match.
+    """
+
+    def __init__(self, min_score=0.25):
+        self.min_score = min_score
+        self.names = []
+        self._dhash = np.zeros((0, HASH_SIZE * HASH_SIZE // 8), dtype=np.uint8)
+        self._phash = np.zeros_like(self._dhash)
+        self._vectors = np.zeros((0, VECTOR_SIZE * VECTOR_SIZE), dtype=np.float32)
+
+    @classmethod
+    def from_directory(cls, path, min_score=0.25):
+        index = cls(min_score=min_score)
+        if not path or not os.path.isdir(path):
+            logging.warning(f"VisualIndex: baseline directory {path!r} not found.")
+            return index
+        for name in sorted(os.listdir(path)):
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                gray = load_gray(os.path.join(path, name))
+                if gray is None:
+                    continue
+                index.add(name, gray)
+        logging.info(f"VisualIndex: {len(index)} baselines loaded from {path}")
+        return index
+
+    def add(self, name, gray):
+        self.names.append(name)
+        self._dhash = np.vstack([self._dhash, dhash(gray)])
+        self._phash = np.vstack([self._phash, phash(gray)])
+        self._vectors = np.vstack([self._vectors, feature_vector(gray).astype(np.float32)])
+
+    def __len__(self):
+        return len(self.names)
+
+    def scores(self, gray):
+        """
+        Similarity in [0, 1] of `gray` to every baseline (mean of dHash, pHash and
+        thumbnail scores). Unrelated hashes agree on about half their bits, so hash
+        agreement is rescaled against chance: 50% -> 0, 100% -> 1.
+        """
+        bits = HASH_SIZE * HASH_SIZE
+        d = np.unpackbits(self._dhash ^ dhash(gray), axis=1).sum(axis=1)
+        p = np.unpackbits(self._phash ^ phash(gray), axis=1).sum(axis=1)
+        d_sim = np.clip(1 - 2 * d / bits, 0.0, 1.0)
+        p_sim = np.clip(1 - 2 * p / bits, 0.0, 1.0)
+        cos = np.clip(self._vectors @ feature_vector(gray).astype(np.float32), 0.0, 1.0)
+        return (d_sim + p_sim + cos) / 3.0
+
+    def match(self, gray):
+        """(score, baseline name) of the closest baseline, or (0.0, None) below min_score."""
+        if not self.names or gray is None:
+            return 0.0, None
+        s = self.scores(gray)
+        best = int(np.argmax(s))
+        if s[best] < self.min_score:
+            return 0.0, None
+        return float(s[best]), self.names[best]
+
+    def match_file(self, path):
+        if not self.names or not path:
+            return 0.0, None
+        return self.match(load_gray(path))